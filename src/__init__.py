@@ -6,47 +6,46 @@ clients and preparing them for Plex, including filename parsing, TMDb metadata
 lookup, file renaming, and video transcoding.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "Bri Stevenski"
 
-# Common utilities (for external use)
-from .common import (
-    # Constants
-    CONTENT_TYPE_MOVIES,
-    CONTENT_TYPE_TV,
-    DEFAULT_LOG_LEVEL,
-    ERROR_FOLDER,
-    LOG_DIR,
-    MEDIA_BASE_FOLDER,
-    RENAME_FOLDER,
-    TRANSCODE_FOLDER,
-    UPLOAD_FOLDER,
-    VIDEO_EXTENSIONS,
-    WORKERS,
-    # File operations
-    scan_media_files,
-    ensure_directory_exists,
-    safe_move_with_backup,
-    # Logging
-    setup_logging,
-)
-# Main script entry points
-from .rename_media_files import main as rename_main
-# Rename utilities (for external use)
-from .rename_utils import (
-    construct_movie_path,
-    construct_tv_show_path,
-    parse_media_file,
-    TMDbClient,
-)
-from .transcode_media_files import main as transcode_main
-# Transcode utilities (for external use)
-from .transcode_utils import (
-    VideoInfo,
-    needs_transcoding,
-    transcode_video,
-    validate_transcoded_file,
-)
+# Every export is loaded on first attribute access via __getattr__ below (PEP 562),
+# from this package's own subpackages (``src.common``, ``src.rename_utils``, ...), so
+# ``import src`` works from a checkout without anything added to sys.path.
+_LAZY_ATTRS = {
+    # Main entry points
+    "rename_main": ("rename_media_files", "main"),
+    "transcode_main": ("transcode_media_files", "main"),
+    # Common utilities
+    "CONTENT_TYPE_MOVIES": ("common", "CONTENT_TYPE_MOVIES"),
+    "CONTENT_TYPE_TV": ("common", "CONTENT_TYPE_TV"),
+    "DEFAULT_LOG_LEVEL": ("common", "DEFAULT_LOG_LEVEL"),
+    "ERROR_FOLDER": ("common", "ERROR_FOLDER"),
+    "LOG_DIR": ("common", "LOG_DIR"),
+    "MEDIA_BASE_FOLDER": ("common", "MEDIA_BASE_FOLDER"),
+    "RENAME_FOLDER": ("common", "RENAME_FOLDER"),
+    "TRANSCODE_FOLDER": ("common", "TRANSCODE_FOLDER"),
+    "UPLOAD_FOLDER": ("common", "UPLOAD_FOLDER"),
+    "VIDEO_EXTENSIONS": ("common", "VIDEO_EXTENSIONS"),
+    "WORKERS": ("common", "WORKERS"),
+    "scan_media_files": ("common", "scan_media_files"),
+    "ensure_directory_exists": ("common", "ensure_directory_exists"),
+    "safe_move_with_backup": ("common", "safe_move_with_backup"),
+    "setup_logging": ("common", "setup_logging"),
+    # Rename utilities
+    "construct_movie_path": ("rename_utils", "construct_movie_path"),
+    "construct_tv_show_path": ("rename_utils", "construct_tv_show_path"),
+    "parse_media_file": ("rename_utils", "parse_media_file"),
+    "parse_media_files": ("rename_utils", "parse_media_files"),
+    "TMDbClient": ("rename_utils", "TMDbClient"),
+    # Transcode utilities
+    "VideoInfo": ("transcode_utils", "VideoInfo"),
+    "needs_transcoding": ("transcode_utils", "needs_transcoding"),
+    "transcode_video": ("transcode_utils", "transcode_video"),
+    "validate_transcoded_file": ("transcode_utils", "validate_transcoded_file"),
+}
 
 __all__ = [
     # Package info
@@ -75,6 +74,7 @@ __all__ = [
     "construct_movie_path",
     "construct_tv_show_path",
     "parse_media_file",
+    "parse_media_files",
     "TMDbClient",
     # Transcode utilities
     "VideoInfo",
@@ -82,3 +82,20 @@ __all__ = [
     "transcode_video",
     "validate_transcoded_file",
 ]
+
+
+def __getattr__(name: str):
+    """Import lazily exported names on first access."""
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module("." + module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List public names, including lazily exported ones."""
+    return list(__all__)
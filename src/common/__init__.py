@@ -13,23 +13,48 @@ from .constants import (
     LOG_DIR,
     MEDIA_BASE_FOLDER,
     RENAME_FOLDER,
+    RENAME_WORKERS,
+    SCAN_QUEUE_SIZE,
+    PARSE_PARALLEL_THRESHOLD,
+    PROBE_CACHE_DIR,
     TRANSCODE_FOLDER,
     UPLOAD_FOLDER,
     VIDEO_EXTENSIONS,
     WORKERS,
-    TMDB_API_KEY,
+    TMDB_APPEND_LIMIT,
     TMDB_BASE_URL,
+    TMDB_CACHE_AIRING_TTL,
+    TMDB_CACHE_DIR,
+    TMDB_CACHE_SEARCH_TTL,
+    TMDB_CACHE_TTL,
+    TMDB_MAX_RETRIES,
+    TMDB_BACKOFF_MAX,
+    TMDB_RATE_BURST,
+    TMDB_RATE_LIMIT,
     TMDB_IMAGE_BASE_URL,
     TRANSCODE_SETTINGS,
 )
-from .file_manager import (
-    FileOperationError,
-    create_error_directory,
-    ensure_directory_exists,
-    safe_move_with_backup,
-    scan_media_files,
-)
-from .logger import setup_logging
+import importlib
+
+# Submodule exports are imported on first attribute access (PEP 562), so
+# importing the constants does not also load sqlite3, threading, etc.
+_LAZY_ATTRS = {
+    # Environment-backed setting, read (and .env loaded) only when first used
+    "TMDB_API_KEY": ".constants",
+    # File manager
+    "FileOperationError": ".file_manager",
+    "create_error_directory": ".file_manager",
+    "ensure_directory_exists": ".file_manager",
+    "safe_move_with_backup": ".file_manager",
+    "scan_media_files": ".file_manager",
+    # Logger
+    "setup_logging": ".logger",
+    # Rate limiting
+    "TMDB_BUCKET": ".rate_limit",
+    "TokenBucket": ".rate_limit",
+    # TMDb cache
+    "TMDbCache": ".tmdb_cache",
+}
 
 __all__ = [
     # Constants
@@ -40,8 +65,23 @@ __all__ = [
     "LOG_DIR",
     "MEDIA_BASE_FOLDER",
     "RENAME_FOLDER",
+    "RENAME_WORKERS",
+    "SCAN_QUEUE_SIZE",
+    "PARSE_PARALLEL_THRESHOLD",
+    "PROBE_CACHE_DIR",
     "TRANSCODE_FOLDER",
     "TRANSCODE_SETTINGS",
+    "TMDB_APPEND_LIMIT",
+    "TMDB_BASE_URL",
+    "TMDB_CACHE_AIRING_TTL",
+    "TMDB_CACHE_DIR",
+    "TMDB_CACHE_SEARCH_TTL",
+    "TMDB_CACHE_TTL",
+    "TMDB_IMAGE_BASE_URL",
+    "TMDB_MAX_RETRIES",
+    "TMDB_BACKOFF_MAX",
+    "TMDB_RATE_BURST",
+    "TMDB_RATE_LIMIT",
     "UPLOAD_FOLDER",
     "VIDEO_EXTENSIONS",
     "WORKERS",
@@ -53,4 +93,26 @@ __all__ = [
     "scan_media_files",
     # Logger
     "setup_logging",
+    # Rate limiting
+    "TMDB_BUCKET",
+    "TokenBucket",
+    # TMDb cache
+    "TMDbCache",
 ]
+
+
+def __getattr__(name: str):
+    """Import lazily exported names on first access."""
+    try:
+        module_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List public names, including lazily exported ones."""
+    return list(__all__)
@@ -10,13 +10,39 @@ organization. A debug setting is also included for troubleshooting processes.
 import os
 import re
 
+_env_loaded = False
+
+
+def _ensure_env() -> None:
+    """Load the .env file once, on first access to an environment-backed setting."""
+    global _env_loaded
+    if _env_loaded:
+        return
+
+    try:
+        from dotenv import load_dotenv
+    except Exception:
+        load_dotenv = None
+
+    if load_dotenv:
+        load_dotenv()
+    _env_loaded = True
+
+
+def __getattr__(name: str):
+    """Resolve environment-backed settings lazily (PEP 562)."""
+    if name == "TMDB_API_KEY":
+        _ensure_env()
+        return os.getenv("TMDB_API_KEY")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Prefer RE2 (linear-time, releases the GIL while matching) for the filename
+# patterns when google-re2 is installed; all of them are plain regular expressions
 try:
-    from dotenv import load_dotenv
+    import re2 as _regex
 except Exception:
-    load_dotenv = None
-
-if load_dotenv:
-    load_dotenv()
+    _regex = re
 
 # Content type constants
 CONTENT_TYPE_MOVIES = "Movies"
@@ -33,6 +59,9 @@ UPLOAD_FOLDER = "upload"
 # Run settings
 DEBUG = False
 WORKERS = 4
+RENAME_WORKERS = 8  # Files processed concurrently by the renamer (TMDb/network bound)
+SCAN_QUEUE_SIZE = 256  # Scanned files buffered ahead of the renamer's workers
+PARSE_PARALLEL_THRESHOLD = 200  # Batches smaller than this are parsed in-process
 
 # Estimated processing parameters
 EST_AVG_SPEED = 1.5  # Estimated average speed multiplier for processing (45min -> ~30min)
@@ -42,31 +71,56 @@ EST_AVG_VIDEO_LENGTH = 2700  # Estimated average video length in seconds (45 min
 VIDEO_EXTENSIONS = {".mkv", ".mp4", ".avi", ".mov", ".m4v", ".webm"}
 
 # Regex patterns for filename parsing
-SEASON_EPISODE_REGEX = re.compile(r"[Ss](\d{1,2})[Ee](\d{1,2})")
-TMDB_ID_REGEX = re.compile(r"tmdb-\d+")
-YEAR_REGEX = re.compile(r"(19|20)\d{2}")
+SEASON_EPISODE_REGEX = _regex.compile(r"[Ss](\d{1,2})[Ee](\d{1,2})")
+TMDB_ID_REGEX = _regex.compile(r"tmdb-\d+")
+YEAR_REGEX = _regex.compile(r"\b(?:19|20)\d{2}\b")
 DATE_REGEXES = [
-    re.compile(r"(20\d{2}|19\d{2})[-_. ](0[1-9]|1[0-2])[-_. ](0[1-9]|[12]\d|3[01])"),
+    _regex.compile(r"(20\d{2}|19\d{2})[-_. ](0[1-9]|1[0-2])[-_. ](0[1-9]|[12]\d|3[01])"),
 ]
-QUALITY_FORMATS_REGEX = re.compile(
-    r"\b(480p|720p|1080p|2160p|4k|hdr|hdr10\+?|dv|web[- ]?dl|bluray|webrip|x264|x265|h\.264|h\.265|ddp?\d?\.?\d?|atmos|remux)\b",
-    flags=re.IGNORECASE,
+# Most common resolutions first so typical filenames hit the earliest branch
+_QUALITY_FORMATS_PATTERN = (
+    r"1080p|720p|2160p|480p|4k|hdr|hdr10\+?|dv|web[- ]?dl|bluray|webrip|x264|x265|h\.264|h\.265|ddp?\d?\.?\d?|atmos|remux"
+)
+QUALITY_FORMATS_REGEX = _regex.compile(rf"(?i)\b({_QUALITY_FORMATS_PATTERN})\b")
+
+# All of the above fused into one alternation so a filename is scanned once;
+# dispatch on match.lastgroup (date is listed before year so it wins on overlap)
+COMBINED_FILENAME_REGEX = _regex.compile(
+    r"(?i)(?P<date>(?P<date_year>19\d{2}|20\d{2})[-_. ](?P<date_month>0[1-9]|1[0-2])[-_. ](?P<date_day>0[1-9]|[12]\d|3[01]))"
+    r"|(?P<se>[Ss](?P<season>\d{1,2})[Ee](?P<episode>\d{1,2}))"
+    r"|(?P<tmdb>tmdb-\d+)"
+    r"|(?P<year>\b(?:19|20)\d{2}\b)"
+    rf"|\b(?P<quality>{_QUALITY_FORMATS_PATTERN})\b"
 )
 
 # TMDb API configuration
-TMDB_API_KEY = os.getenv("TMDB_API_KEY")
+# TMDB_API_KEY is read from the environment (or .env) on first access, see __getattr__ above
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/original"
+TMDB_CACHE_DIR = "./.tmdb_cache"
+TMDB_CACHE_TTL = 7 * 86400  # Seconds a cached TMDb response stays fresh (7 days)
+TMDB_CACHE_AIRING_TTL = 86400  # Shorter freshness for TV data that may still change (24 hours)
+TMDB_CACHE_SEARCH_TTL = 86400  # Search results pick up newly added titles (24 hours)
+TMDB_RATE_LIMIT = 50  # Sustained TMDb requests per second
+TMDB_RATE_BURST = 20  # Maximum burst of TMDb requests
+TMDB_MAX_RETRIES = 5  # Retries for a TMDb request rejected with 429 Too Many Requests
+TMDB_BACKOFF_MAX = 30  # Longest backoff in seconds between those retries
+TMDB_APPEND_LIMIT = 20  # Maximum append_to_response sub-requests per TMDb call
 
 # Transcoding settings for Apple TV compatibility
 TRANSCODE_SETTINGS = {
     "video_codec": "libx264",
     "audio_codec": "aac",
     "preset": "medium",
+    "profile": "high",  # H.264 profile every Apple TV generation decodes
     "crf": 23,
     "audio_bitrate": "128k",
     "max_audio_channels": 2,
+    "hw_encoder": True,  # Prefer a working hardware H.264 encoder (VideoToolbox/NVENC/QSV/VAAPI) over video_codec
+    "trust_mp4_suffix": True,  # Treat .mp4 files as compatible without probing them
+    "scratch_dir": None,  # Local directory ffmpeg writes into before the move (None: the system temp dir)
 }
+PROBE_CACHE_DIR = "./.probe_cache"  # On-disk ffprobe results, keyed by path, mtime and size
 
 # Logging configuration
 LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "WARNING": 30, "ERROR": 40}
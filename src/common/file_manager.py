@@ -5,15 +5,53 @@ This module provides functions for scanning, moving, copying, and organizing
 media files throughout the processing pipeline.
 """
 
+import errno
+import functools
 import logging
+import os
+import queue
 import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Dict, Generator, List, Optional, Tuple, Union
 
-from .constants import VIDEO_EXTENSIONS
+from .constants import VIDEO_EXTENSIONS, WORKERS
+
+try:
+    import fcntl
+except Exception:
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# Free space per directory as (monotonic timestamp, bytes free); free space does not
+# meaningfully change between files of a batch, so a short TTL avoids repeated statvfs calls
+_SPACE_CACHE: Dict[str, Tuple[float, int]] = {}
+_SPACE_CACHE_TTL = 2.0
+
+# Extension check on the filename tail only: str.endswith over a tuple avoids building
+# a suffix string and lowercasing the whole name for every directory entry
+_VIDEO_SUFFIXES = tuple(VIDEO_EXTENSIONS)
+_VIDEO_SUFFIX_MAX_LEN = max(len(ext) for ext in VIDEO_EXTENSIONS)
+
+# Linux FICLONE ioctl: share the source's extents with the destination (reflink) on
+# filesystems that support it (Btrfs, XFS), e.g. across Btrfs subvolumes where rename fails
+_FICLONE = 0x40049409
+
+# Copies larger than this are dropped from the page cache once written, so moving a
+# multi-GB video does not evict everything else other processes have cached
+_DROP_CACHE_THRESHOLD = 256 * 1024 * 1024
+
+# Files each concurrent subdirectory walk may buffer ahead of the consumer; a walk
+# that gets this far ahead blocks until its directory's turn comes
+_SCAN_BUFFER = 256
+_SCAN_DONE = object()
+
+# Size of the first copy_file_range call, made before the destination is preallocated
+_COPY_PROBE_SIZE = 1024 * 1024
+
 
 class FileOperationError(Exception):
     """Exception for file operation failures."""
@@ -22,9 +60,11 @@ class FileOperationError(Exception):
 
 
 ### Internal helper functions ###
-def _get_file_size(filepath: Path) -> int:
-    """Get file size in bytes."""
+def _get_file_size(filepath: Union[Path, os.DirEntry]) -> int:
+    """Get file size in bytes, reusing the cached stat of a DirEntry when given one."""
     try:
+        if isinstance(filepath, os.DirEntry):
+            return filepath.stat(follow_symlinks=False).st_size
         return filepath.stat().st_size
     except OSError:
         return 0
@@ -32,12 +72,103 @@ def _get_file_size(filepath: Path) -> int:
 
 def _get_available_space(directory: Path) -> int:
     """Get available disk space in bytes for a directory."""
+    key = str(directory)
+    now = time.monotonic()
+    cached = _SPACE_CACHE.get(key)
+    if cached and now - cached[0] < _SPACE_CACHE_TTL:
+        return cached[1]
+
     try:
-        stat = shutil.disk_usage(directory)
-        return stat.free
+        free = shutil.disk_usage(directory).free
     except OSError:
         return 0
 
+    _SPACE_CACHE[key] = (now, free)
+    return free
+
+
+def _try_reflink(fin, fout) -> bool:
+    """Clone the source's data into the destination with FICLONE; False if unsupported."""
+    if fcntl is None:
+        return False
+
+    try:
+        fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+        return True
+    except OSError:
+        return False
+
+
+def _drop_page_cache(fin, fout) -> None:
+    """Flush the destination and advise the kernel to drop both files' cached pages."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    try:
+        # Dirty pages cannot be dropped, so write the destination back first
+        os.fdatasync(fout.fileno())
+        os.posix_fadvise(fout.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+        os.posix_fadvise(fin.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError as e:
+        logger.debug(f"Failed to drop page cache after copy: {e}")
+
+
+def _fast_cross_device_move(source: Path, destination: Path) -> bool:
+    """
+    Move a file across filesystems without copying through user space.
+
+    A reflink (FICLONE) is tried first, which shares the data blocks instead of
+    copying them; otherwise the data is copied in-kernel with copy_file_range into
+    a preallocated destination. Returns False without moving anything when the
+    platform or the filesystem pair supports neither, so the caller can fall back
+    to shutil.move.
+    """
+    if fcntl is None and not hasattr(os, "copy_file_range"):
+        return False
+
+    try:
+        size = source.stat().st_size
+        remaining = size
+        with open(source, "rb") as fin, open(destination, "wb") as fout:
+            if size and _try_reflink(fin, fout):
+                remaining = 0
+            elif not hasattr(os, "copy_file_range"):
+                raise OSError("copy_file_range not available")
+            elif size:
+                # Copy a small first chunk before preallocating: when copy_file_range is
+                # unsupported between these filesystems it fails here, before a multi-GB
+                # preallocation (written block by block where glibc emulates it) is wasted
+                remaining -= os.copy_file_range(fin.fileno(), fout.fileno(), min(size, _COPY_PROBE_SIZE))
+                if remaining and hasattr(os, "posix_fallocate"):
+                    try:
+                        os.posix_fallocate(fout.fileno(), 0, size)
+                    except OSError:
+                        pass  # Preallocation is only an optimization
+
+            while remaining > 0:
+                copied = os.copy_file_range(fin.fileno(), fout.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+
+            if not remaining and size > _DROP_CACHE_THRESHOLD:
+                _drop_page_cache(fin, fout)
+
+        if remaining:
+            raise OSError(f"short copy, {remaining} bytes not copied")
+
+        shutil.copystat(source, destination)
+    except OSError as e:
+        logger.debug(f"Fast cross-device move unavailable for {source}, falling back: {e}")
+        try:
+            destination.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return False
+
+    source.unlink()
+    return True
+
 
 def _move_file(source: Path, destination: Path, create_dirs: bool = True) -> None:
     """
@@ -48,19 +179,83 @@ def _move_file(source: Path, destination: Path, create_dirs: bool = True) -> Non
         destination: Destination file path
         create_dirs: Whether to create parent directories for destination
     """
-    if not source.exists():
-        raise FileOperationError(f"Source file does not exist: {source}")
-
     if create_dirs:
         ensure_directory_exists(destination.parent)
 
     try:
-        shutil.move(str(source), str(destination))
+        # Same-filesystem moves are a single atomic rename; cross-device moves need a copy
+        try:
+            os.replace(source, destination)
+        except OSError as e:
+            # A missing source surfaces here, so it is only stat'ed when the move fails
+            if e.errno == errno.ENOENT and not source.exists():
+                raise FileOperationError(f"Source file does not exist: {source}")
+            if e.errno == errno.ENOENT and create_dirs:
+                # The destination directory was removed after it was memoized as ensured
+                ensure_directory_exists.cache_clear()
+                ensure_directory_exists(destination.parent)
+                _move_file(source, destination, create_dirs=False)
+                return
+            if e.errno != errno.EXDEV:
+                raise
+            if not _fast_cross_device_move(source, destination):
+                shutil.move(str(source), str(destination))
         logger.info(f"Moved file: {source} -> {destination}")
     except OSError as e:
         raise FileOperationError(f"Failed to move file {source} to {destination}: {e}")
 
 
+def _list_dir(directory: str) -> Tuple[List[Path], List[str]]:
+    """List one directory level with os.scandir, returning (video files, subdirectory paths)."""
+    video_suffixes = _VIDEO_SUFFIXES
+    tail_len = -_VIDEO_SUFFIX_MAX_LEN
+    files = []
+    subdirs = []
+
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file() and entry.name[tail_len:].lower().endswith(video_suffixes):
+                    files.append(Path(entry.path))
+    except OSError as e:
+        logger.warning(f"Failed to scan directory {directory}: {e}")
+
+    return files, subdirs
+
+
+def _scan_dir(directory: str, recursive: bool) -> Generator[Path, None, None]:
+    """Walk a directory with os.scandir, yielding video files without extra stat calls."""
+    files, subdirs = _list_dir(directory)
+    yield from files
+
+    if recursive:
+        for subdir in subdirs:
+            yield from _scan_dir(subdir, recursive)
+
+
+def _put_unless_stopped(out: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put an item on a bounded queue, giving up once stop is set; False if it gave up."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _scan_dir_into(directory: str, out: queue.Queue, stop: threading.Event) -> None:
+    """Recursively stream video files under a directory into a bounded queue (thread pool worker)."""
+    try:
+        for filepath in _scan_dir(directory, recursive=True):
+            if not _put_unless_stopped(out, filepath, stop):
+                return
+    finally:
+        _put_unless_stopped(out, _SCAN_DONE, stop)
+
+
 ### Public functions ###
 def scan_media_files(directory: Path, recursive: bool = True) -> Generator[Path, None, None]:
     """
@@ -81,13 +276,39 @@ def scan_media_files(directory: Path, recursive: bool = True) -> Generator[Path,
         logger.error(f"Path is not a directory: {directory}")
         return
 
-    pattern = "**/*" if recursive else "*"
+    files, subdirs = _list_dir(str(directory))
+    yield from files
 
-    for path in directory.glob(pattern):
-        if path.is_file() and path.suffix.lower() in VIDEO_EXTENSIONS:
-            yield path
+    if not recursive:
+        return
 
+    if len(subdirs) <= 1:
+        for subdir in subdirs:
+            yield from _scan_dir(subdir, recursive)
+        return
 
+    # Directory reads release the GIL, so walking top-level subdirectories
+    # concurrently overlaps per-call latency on network shares. Each walk streams
+    # into its own bounded queue, and the queues are drained in directory order, so
+    # files come out in the same order as a sequential walk and nothing is held
+    # beyond _SCAN_BUFFER files per subdirectory
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=_SCAN_BUFFER) for _ in subdirs]
+    executor = ThreadPoolExecutor(max_workers=min(WORKERS, len(subdirs)))
+    try:
+        futures = [executor.submit(_scan_dir_into, subdir, out, stop) for subdir, out in zip(subdirs, queues)]
+        for future, out in zip(futures, queues):
+            yield from iter(out.get, _SCAN_DONE)
+            future.result()
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Once a path has been ensured, later calls (one per moved file) skip the mkdir syscall
+# entirely. The renamer and transcoder clear the memo at the start of each run, and
+# _move_file clears it if a memoized directory turns out to have been removed
+@functools.lru_cache(maxsize=None)
 def ensure_directory_exists(directory: Path) -> None:
     """Ensure a directory exists, creating it if necessary."""
     try:
@@ -127,6 +348,7 @@ def safe_move_with_backup(source: Path, destination: Path, error_dir: Optional[P
         return False
 
 
+@functools.lru_cache(maxsize=None)
 def create_error_directory(base_error_dir: Path, content_type: str) -> Path:
     """Create an error directory for a specific content type."""
     error_dir = base_error_dir / content_type
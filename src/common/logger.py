@@ -5,22 +5,48 @@ This module provides a centralized logging system with JSON formatting,
 multiple log levels, and file rotation capabilities.
 """
 
+import atexit
 import json
 import logging
 import logging.handlers
+import queue
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# LogRecord attribute that carries PlexLogger keyword fields to the formatter
+_EXTRA_ATTR = "_plex_extra"
+
+# Keyword arguments that are not forwarded as structured fields
+_DROPPED_KWARGS = frozenset({"exc_info", "stack_info"})
+
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
 
+    # Formatted "YYYY-MM-DDTHH:MM:SS" prefix of the last second seen; records
+    # arrive in bursts within the same second, so strftime runs once per second
+    _cached_second: int = -1
+    _cached_prefix: str = ""
+
+    def _format_timestamp(self, created: float) -> str:
+        """Format a record timestamp as local ISO 8601 with microseconds."""
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+            self._cached_second = second
+        return f"{self._cached_prefix}.{int((created - second) * 1_000_000):06d}"
+
     def format(self, record: logging.LogRecord) -> str:
         """Format a log record as JSON."""
         log_entry = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": self._format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -33,34 +59,14 @@ class JSONFormatter(logging.Formatter):
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
 
-        # Add extra fields from record
-        for key, value in record.__dict__.items():
-            if key not in {
-                "name",
-                "msg",
-                "args",
-                "levelname",
-                "levelno",
-                "pathname",
-                "filename",
-                "module",
-                "lineno",
-                "funcName",
-                "created",
-                "msecs",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "processName",
-                "process",
-                "getMessage",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-            }:
-                log_entry[key] = value
-
-        return json.dumps(log_entry)
+        # Add extra fields passed through PlexLogger
+        extra = getattr(record, _EXTRA_ATTR, None)
+        if extra:
+            log_entry.update(extra)
+
+        if orjson is not None:
+            return orjson.dumps(log_entry, default=str).decode("utf-8")
+        return json.dumps(log_entry, default=str)
 
 
 class PlexLogger:
@@ -91,13 +97,14 @@ class PlexLogger:
 
         # Clear any existing handlers
         self.logger.handlers.clear()
+        handlers = []
 
         # Set up console handler if enabled
         if enable_console:
             console_handler = logging.StreamHandler(sys.stdout)
             console_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
             console_handler.setFormatter(console_formatter)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
 
         # Set up file handler
         log_dir = log_dir or Path.cwd() / ".logs"
@@ -112,36 +119,53 @@ class PlexLogger:
         )
         file_formatter = JSONFormatter()
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
-
-    def debug(self, message: str, **kwargs) -> None:
+        handlers.append(file_handler)
+
+        # Format and write records on a listener thread; callers only enqueue
+        log_queue: queue.Queue = queue.Queue(-1)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Flush pending records and stop the background listener."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    def debug(self, message: str, *args, **kwargs) -> None:
         """Log a debug message."""
-        self._log(logging.DEBUG, message, **kwargs)
+        self._log(logging.DEBUG, message, *args, **kwargs)
 
-    def info(self, message: str, **kwargs) -> None:
+    def info(self, message: str, *args, **kwargs) -> None:
         """Log an info message."""
-        self._log(logging.INFO, message, **kwargs)
+        self._log(logging.INFO, message, *args, **kwargs)
 
-    def warning(self, message: str, **kwargs) -> None:
+    def warning(self, message: str, *args, **kwargs) -> None:
         """Log a warning message."""
-        self._log(logging.WARNING, message, **kwargs)
+        self._log(logging.WARNING, message, *args, **kwargs)
 
-    def error(self, message: str, **kwargs) -> None:
+    def error(self, message: str, *args, **kwargs) -> None:
         """Log an error message."""
-        self._log(logging.ERROR, message, **kwargs)
+        self._log(logging.ERROR, message, *args, **kwargs)
 
-    def critical(self, message: str, **kwargs) -> None:
+    def critical(self, message: str, *args, **kwargs) -> None:
         """Log a critical message."""
-        self._log(logging.CRITICAL, message, **kwargs)
+        self._log(logging.CRITICAL, message, *args, **kwargs)
 
-    def _log(self, level: int, message: str, **kwargs) -> None:
-        """Internal logging method with extra fields."""
-        extra = {}
-        for key, value in kwargs.items():
-            if key not in {"exc_info", "stack_info"}:
-                extra[key] = value
+    def _log(self, level: int, message: str, *args, **kwargs) -> None:
+        """Internal logging method with extra fields.
 
-        self.logger.log(level, message, extra=extra)
+        Positional args are %-formatted lazily, only if the record is actually emitted.
+        """
+        if not kwargs:
+            # Most calls carry no structured fields; skip building the extras dict
+            self.logger.log(level, message, *args)
+            return
+
+        extra = {key: value for key, value in kwargs.items() if key not in _DROPPED_KWARGS}
+        self.logger.log(level, message, *args, extra={_EXTRA_ATTR: extra})
 
     def log_file_operation(
             self,
@@ -239,6 +263,9 @@ def setup_logging(
     if log_dir is None:
         log_dir = Path.cwd() / ".logs"
 
+    if _global_logger is not None:
+        _global_logger.close()
+
     _global_logger = PlexLogger(
         log_level=log_level,
         log_dir=log_dir,
@@ -259,26 +286,26 @@ def get_logger() -> PlexLogger:
 
 
 # Convenience functions that use the global logger
-def debug(message: str, **kwargs) -> None:
+def debug(message: str, *args, **kwargs) -> None:
     """Log a debug message using the global logger."""
-    get_logger().debug(message, **kwargs)
+    get_logger().debug(message, *args, **kwargs)
 
 
-def info(message: str, **kwargs) -> None:
+def info(message: str, *args, **kwargs) -> None:
     """Log an info message using the global logger."""
-    get_logger().info(message, **kwargs)
+    get_logger().info(message, *args, **kwargs)
 
 
-def warning(message: str, **kwargs) -> None:
+def warning(message: str, *args, **kwargs) -> None:
     """Log a warning message using the global logger."""
-    get_logger().warning(message, **kwargs)
+    get_logger().warning(message, *args, **kwargs)
 
 
-def error(message: str, **kwargs) -> None:
+def error(message: str, *args, **kwargs) -> None:
     """Log an error message using the global logger."""
-    get_logger().error(message, **kwargs)
+    get_logger().error(message, *args, **kwargs)
 
 
-def critical(message: str, **kwargs) -> None:
+def critical(message: str, *args, **kwargs) -> None:
     """Log a critical message using the global logger."""
-    get_logger().critical(message, **kwargs)
+    get_logger().critical(message, *args, **kwargs)
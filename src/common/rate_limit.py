@@ -0,0 +1,55 @@
+"""
+Rate limiting utilities for external API access.
+
+This module provides a thread-safe token bucket shared by all workers, so
+concurrent TMDb lookups stay within the API's request rate limits.
+"""
+
+import threading
+import time
+
+from .constants import TMDB_RATE_BURST, TMDB_RATE_LIMIT
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, sleeping until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Reserve the token now; a negative balance is the wait owed by this caller
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for at least `seconds` (e.g. after the server asks us to slow down)."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Owe at least `seconds` worth of tokens, so the next acquire sleeps that long
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+# Shared bucket for all TMDb requests in this process
+TMDB_BUCKET = TokenBucket(rate=TMDB_RATE_LIMIT, capacity=TMDB_RATE_BURST)
@@ -0,0 +1,127 @@
+"""
+On-disk cache for TMDb API responses.
+
+This module provides a small SQLite-backed cache keyed by request endpoint and
+parameters, so repeated runs over the same media do not re-issue identical
+TMDb requests. Entries expire after a TTL and keep the response ETag so an
+expired entry can be revalidated cheaply.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+from .constants import TMDB_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+
+def _loads(text: str) -> Dict[str, Any]:
+    """Decode a cached response, with orjson when it is installed."""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def _dumps(value: Dict[str, Any]) -> str:
+    """Encode a response for the cache, with orjson when it is installed."""
+    return orjson.dumps(value).decode("utf-8") if orjson is not None else json.dumps(value)
+
+
+class TMDbCache:
+    """SQLite-backed TMDb response cache with per-entry expiry."""
+
+    def __init__(self, cache_dir: Path, ttl: int = TMDB_CACHE_TTL):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            ttl: Default time-to-live for new entries in seconds
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(cache_dir / "responses.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, etag TEXT, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a stable cache key from an endpoint and its query parameters."""
+        items = sorted((params or {}).items())
+        return hashlib.blake2b(f"{endpoint}?{items}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a key, or None if missing or expired."""
+        row = self._fetch(key)
+        if row is None or row[2] <= time.time():
+            return None
+        return _loads(row[0])
+
+    def get_stale(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Return the cached response and its ETag regardless of expiry."""
+        row = self._fetch(key)
+        if row is None:
+            return None, None
+        return _loads(row[0]), row[1]
+
+    def set(self, key: str, value: Dict[str, Any], expire: Optional[int] = None, etag: Optional[str] = None) -> None:
+        """Store a response under a key for `expire` seconds (default: the cache TTL)."""
+        expires_at = time.time() + (self.ttl if expire is None else expire)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, etag, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, _dumps(value), etag, expires_at),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write TMDb cache entry: {e}")
+
+    def touch(self, key: str, expire: Optional[int] = None) -> None:
+        """Extend the expiry of an existing entry (e.g. after a 304 revalidation)."""
+        expires_at = time.time() + (self.ttl if expire is None else expire)
+        try:
+            with self._lock:
+                self._conn.execute("UPDATE responses SET expires_at = ? WHERE key = ?", (expires_at, key))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to refresh TMDb cache entry: {e}")
+
+    def clear(self) -> None:
+        """Delete every cached response."""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to clear TMDb cache: {e}")
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
+
+    def _fetch(self, key: str) -> Optional[Tuple[str, Optional[str], float]]:
+        """Fetch the raw (value, etag, expires_at) row for a key."""
+        try:
+            with self._lock:
+                return self._conn.execute(
+                    "SELECT value, etag, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read TMDb cache entry: {e}")
+            return None
@@ -12,36 +12,66 @@ This script processes media files by:
 """
 
 import argparse
+import concurrent.futures
+import queue
 import signal
 import sys
+import threading
 from pathlib import Path
 
-# Add the src directory to Python path for imports
-sys.path.insert(0, str(Path(__file__).parent))
-
-from common import (
-    DEFAULT_LOG_LEVEL,
-    LOG_DIR,
-    MEDIA_BASE_FOLDER,
-    RENAME_FOLDER,
-    CONTENT_TYPE_MOVIES,
-    CONTENT_TYPE_TV,
-    TRANSCODE_FOLDER,
-    UPLOAD_FOLDER,
-    ERROR_FOLDER,
-    scan_media_files,
-    ensure_directory_exists,
-    safe_move_with_backup,
-    create_error_directory,
-    setup_logging,
-)
-from rename_utils import (
-    construct_movie_path,
-    construct_tv_show_path,
-    parse_media_file,
-    TMDbClient,
-    TMDbError,
-)
+try:
+    from .common import (
+        DEFAULT_LOG_LEVEL,
+        LOG_DIR,
+        MEDIA_BASE_FOLDER,
+        RENAME_FOLDER,
+        RENAME_WORKERS,
+        SCAN_QUEUE_SIZE,
+        CONTENT_TYPE_MOVIES,
+        CONTENT_TYPE_TV,
+        TRANSCODE_FOLDER,
+        UPLOAD_FOLDER,
+        ERROR_FOLDER,
+        scan_media_files,
+        ensure_directory_exists,
+        safe_move_with_backup,
+        create_error_directory,
+        setup_logging,
+    )
+    from .rename_utils import (
+        construct_movie_path,
+        construct_tv_show_path,
+        parse_media_file,
+        TMDbClient,
+        TMDbError,
+    )
+except ImportError:
+    # Installed as top-level packages rather than imported through src
+    from common import (
+        DEFAULT_LOG_LEVEL,
+        LOG_DIR,
+        MEDIA_BASE_FOLDER,
+        RENAME_FOLDER,
+        RENAME_WORKERS,
+        SCAN_QUEUE_SIZE,
+        CONTENT_TYPE_MOVIES,
+        CONTENT_TYPE_TV,
+        TRANSCODE_FOLDER,
+        UPLOAD_FOLDER,
+        ERROR_FOLDER,
+        scan_media_files,
+        ensure_directory_exists,
+        safe_move_with_backup,
+        create_error_directory,
+        setup_logging,
+    )
+    from rename_utils import (
+        construct_movie_path,
+        construct_tv_show_path,
+        parse_media_file,
+        TMDbClient,
+        TMDbError,
+    )
 
 
 class MediaRenamer:
@@ -52,6 +82,7 @@ class MediaRenamer:
             dry_run: bool = False,
             log_level: str = DEFAULT_LOG_LEVEL,
             use_episode_titles: bool = False,
+            max_concurrency: int = RENAME_WORKERS,
     ):
         """
         Initialize the Media Renamer.
@@ -60,10 +91,17 @@ class MediaRenamer:
             dry_run: Preview changes without making modifications
             log_level: Logging level
             use_episode_titles: Trust episode titles over S##E## numbers for TV shows during TMDb lookup
+            max_concurrency: Number of files processed concurrently
         """
         self.dry_run = dry_run
         self.log_level = log_level
         self.use_episode_titles = use_episode_titles
+        self.max_concurrency = max_concurrency
+
+        # Destination roots are fixed for the whole run
+        self._upload_dir = Path(MEDIA_BASE_FOLDER, UPLOAD_FOLDER)
+        self._transcode_dir = Path(MEDIA_BASE_FOLDER, TRANSCODE_FOLDER)
+        self._error_dir_root = Path(MEDIA_BASE_FOLDER, ERROR_FOLDER)
 
         # Set up logging
         self.logger = setup_logging(
@@ -74,11 +112,23 @@ class MediaRenamer:
 
         # Initialize TMDb client
         try:
-            self.tmdb_client = TMDbClient()
+            self.tmdb_client = TMDbClient(pool_size=max_concurrency)
         except TMDbError as e:
             self.logger.error(f"Failed to initialize TMDb client: {e}")
             sys.exit(1)
 
+        # Per-run memo of show/movie matches: every episode of a season resolves to the
+        # same series, so only the first file needs the search round-trips
+        self._tmdb_match_cache: dict[tuple, dict | None] = {}
+        self._tmdb_match_fetch_locks: dict[tuple, threading.Lock] = {}
+        self._tmdb_match_lock = threading.Lock()
+
+        # Per-run season listings keyed by (tmdb_id, season): one request serves every
+        # episode of that season in the queue
+        self._season_cache: dict[tuple[int, int], dict[int, dict]] = {}
+        self._season_fetch_locks: dict[tuple[int, int], threading.Lock] = {}
+        self._season_lock = threading.Lock()
+
         # Set up signal handlers for graceful shutdown
         self.running = True
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -87,7 +137,7 @@ class MediaRenamer:
         except (AttributeError, OSError):
             pass
 
-        self.logger.info("Media Renamer initialized", dry_run=dry_run)
+        self.logger.info("Media Renamer initialized", dry_run=dry_run, max_concurrency=max_concurrency)
 
     def _signal_handler(self, signum, _frame):
         """Handle shutdown signals gracefully."""
@@ -113,41 +163,71 @@ class MediaRenamer:
         mp4_files_moved = 0
         non_mp4_files_moved = 0
 
-        # Process each content type
+        def record_result(future: concurrent.futures.Future) -> None:
+            """Fold one finished file into the summary counters (main thread only)."""
+            nonlocal total_files_processed, total_files_successful, total_files_failed
+            nonlocal mp4_files_moved, non_mp4_files_moved
+
+            filepath, extension = pending.pop(future)
+            total_files_processed += 1
+
+            try:
+                success = future.result()
+                if success:
+                    # If processing succeeded, check what type of file it was
+                    # We need to track this differently since move success doesn't tell us file type
+                    if extension == ".mp4":
+                        mp4_files_moved += 1
+                    else:
+                        non_mp4_files_moved += 1
+                    total_files_successful += 1
+                else:
+                    total_files_failed += 1
+
+            except Exception as e:
+                self.logger.error(f"Failed to process file {filepath}: {e}")
+                self._handle_error(filepath, str(e))
+                total_files_failed += 1
+
+        # The directory walk runs on its own thread and feeds a bounded queue, so
+        # processing starts before the walk finishes and only a window of the listing
+        # is held in memory; files are independent, so TMDb round-trips and moves for
+        # different files overlap on the worker threads
+        file_queue: queue.Queue = queue.Queue(maxsize=SCAN_QUEUE_SIZE)
+        scanner = threading.Thread(target=self._scan_queue, args=(queue_dir, file_queue), daemon=True)
+        pending: dict[concurrent.futures.Future, tuple[Path, str]] = {}
+        max_pending = self.max_concurrency * 2
+
         try:
-            for content_type in [CONTENT_TYPE_MOVIES, CONTENT_TYPE_TV]:
-                content_queue_dir = queue_dir / content_type
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                scanner.start()
 
-                if not content_queue_dir.exists():
-                    self.logger.debug(f"Queue directory does not exist: {content_queue_dir}")
-                    continue
+                while self.running:
+                    item = file_queue.get()
+                    if item is None:
+                        break
 
-                self.logger.info(f"Processing {content_type} from: {content_queue_dir}")
+                    filepath, content_type, media_info = item
+                    # Lowercased once here and shared by the move and the summary counters
+                    extension = filepath.suffix.lower()
+                    future = executor.submit(self._process_file, filepath, content_type, extension, media_info)
+                    pending[future] = (filepath, extension)
 
-                for filepath in scan_media_files(content_queue_dir):
-                    if not self.running:
-                        break
+                    # Keep a small backlog ahead of the workers rather than the whole queue
+                    if len(pending) >= max_pending:
+                        done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            record_result(future)
 
-                    total_files_processed += 1
-
-                    try:
-                        success = self._process_file(filepath, content_type)
-                        if success:
-                            # If processing succeeded, check what type of file it was
-                            # We need to track this differently since move success doesn't tell us file type
-                            extension = filepath.suffix.lower()
-                            if extension == ".mp4":
-                                mp4_files_moved += 1
-                            else:
-                                non_mp4_files_moved += 1
-                            total_files_successful += 1
-                        else:
-                            total_files_failed += 1
-
-                    except Exception as e:
-                        self.logger.error(f"Failed to process file {filepath}: {e}")
-                        self._handle_error(filepath, str(e))
-                        total_files_failed += 1
+                if not self.running:
+                    executor.shutdown(wait=False, cancel_futures=True)
+
+                # Drain the files still in flight
+                for future in concurrent.futures.as_completed(list(pending)):
+                    if future.cancelled():
+                        pending.pop(future)
+                        continue
+                    record_result(future)
 
         except KeyboardInterrupt:
             self.logger.info("Processing interrupted by user")
@@ -176,26 +256,89 @@ class MediaRenamer:
 
     def _setup_directories(self) -> None:
         """Ensure all required directories exist."""
+        # Directories may have been removed since an earlier run in this process
+        ensure_directory_exists.cache_clear()
+        create_error_directory.cache_clear()
+
         directories = [
-            Path(MEDIA_BASE_FOLDER, TRANSCODE_FOLDER) / CONTENT_TYPE_MOVIES,
-            Path(MEDIA_BASE_FOLDER, TRANSCODE_FOLDER) / CONTENT_TYPE_TV,
-            Path(MEDIA_BASE_FOLDER, UPLOAD_FOLDER) / CONTENT_TYPE_MOVIES,
-            Path(MEDIA_BASE_FOLDER, UPLOAD_FOLDER) / CONTENT_TYPE_TV,
-            Path(MEDIA_BASE_FOLDER, ERROR_FOLDER),
+            self._transcode_dir / CONTENT_TYPE_MOVIES,
+            self._transcode_dir / CONTENT_TYPE_TV,
+            self._upload_dir / CONTENT_TYPE_MOVIES,
+            self._upload_dir / CONTENT_TYPE_TV,
+            self._error_dir_root,
         ]
 
         for directory in directories:
             ensure_directory_exists(directory)
             self.logger.debug(f"Ensured directory exists: {directory}")
 
-    def _process_file(self, filepath: Path, content_type: str) -> bool:
-        """Process a single media file through the renaming pipeline."""
+    def _scan_queue(self, queue_dir: Path, file_queue: queue.Queue) -> None:
+        """Walk the queue directories and feed (filepath, content_type, media_info) items to the workers."""
+        try:
+            for content_type in [CONTENT_TYPE_MOVIES, CONTENT_TYPE_TV]:
+                content_queue_dir = queue_dir / content_type
+
+                if not content_queue_dir.exists():
+                    self.logger.debug(f"Queue directory does not exist: {content_queue_dir}")
+                    continue
+
+                self.logger.info(f"Processing {content_type} from: {content_queue_dir}")
+
+                window = []
+                # Close the walk explicitly so a shutdown stops its directory reads right away
+                scan = scan_media_files(content_queue_dir)
+                try:
+                    for filepath in scan:
+                        if not self.running:
+                            return
+                        window.append((filepath, content_type, self._parse_for_queue(filepath)))
+                        if len(window) >= SCAN_QUEUE_SIZE:
+                            self._enqueue_grouped(window, file_queue)
+                            window = []
+                finally:
+                    scan.close()
+                self._enqueue_grouped(window, file_queue)
+        except Exception as e:
+            self.logger.error(f"Failed to scan queue directory {queue_dir}: {e}")
+        finally:
+            # Sentinel: no more files
+            file_queue.put(None)
+
+    @staticmethod
+    def _parse_for_queue(filepath: Path) -> dict | None:
+        """Parse a filename while scanning; failures are left for _process_file to report."""
+        try:
+            return parse_media_file(filepath)
+        except Exception:
+            return None
+
+    def _enqueue_grouped(self, window: list[tuple[Path, str, dict | None]], file_queue: queue.Queue) -> None:
+        """Queue a window of scanned files grouped by (title, season).
+
+        Episodes of the same show and season then run back to back, so they share the
+        show match and season listing, and their moves land in the same directory.
+        """
+        def group_key(item: tuple[Path, str, dict | None]) -> tuple[str, int]:
+            media_info = item[2]
+            if media_info is None:
+                return "", 0
+            return media_info["title"].lower(), media_info.get("season") or 0
+
+        for item in sorted(window, key=group_key):
+            file_queue.put(item)
+
+    def _process_file(self, filepath: Path, content_type: str, extension: str, media_info: dict | None = None) -> bool:
+        """Process a single media file through the renaming pipeline.
+
+        media_info may be passed in when the filename was already parsed while scanning.
+        """
         self.logger.info(f"Processing file: {filepath}")
 
         try:
             # Step 1: Parse filename
-            media_info = parse_media_file(filepath)
-            self.logger.debug(f"Parsed media info: {media_info}")
+            if media_info is None:
+                media_info = parse_media_file(filepath)
+            self.logger.debug("Parsed media info: %s", media_info)
 
             # Step 2: Lookup TMDb metadata
             tmdb_data = self._lookup_tmdb_metadata(media_info)
@@ -208,10 +351,10 @@ class MediaRenamer:
 
             # Step 3: Format new filename and path
             new_path = self._format_new_path(media_info, tmdb_data, filepath)
-            self.logger.debug(f"New path: {new_path}")
+            self.logger.debug("New path: %s", new_path)
 
             # Step 4: Move to appropriate destination based on file extension
-            return self._move_to_destination(filepath, new_path, content_type)
+            return self._move_to_destination(filepath, new_path, content_type, extension)
 
         except Exception as e:
             self.logger.error(f"Processing failed for {filepath}: {e}")
@@ -219,17 +362,36 @@ class MediaRenamer:
 
     def _lookup_tmdb_metadata(self, media_info: dict) -> dict | None:
         """Lookup metadata from TMDb API."""
+        # Matching does not depend on use_episode_titles, so it is not part of the key
+        cache_key = (media_info["content_type"], media_info["title"].lower(), media_info["year"])
+        with self._tmdb_match_lock:
+            fetch_lock = self._tmdb_match_fetch_locks.setdefault(cache_key, threading.Lock())
+
         try:
-            if media_info["content_type"] == CONTENT_TYPE_MOVIES:
-                result = self.tmdb_client.find_best_movie_match(media_info["title"], media_info["year"])
-            else:  # TV Show
-                result = self.tmdb_client.find_best_tv_match(media_info["title"], media_info["year"],
-                                                             self.use_episode_titles)
+            # Workers handling the same title wait for the first search instead of repeating it
+            with fetch_lock:
+                if cache_key in self._tmdb_match_cache:
+                    return self._tmdb_match_cache[cache_key]
+
+                if media_info["content_type"] == CONTENT_TYPE_MOVIES:
+                    result = self.tmdb_client.find_best_movie_match(media_info["title"], media_info["year"])
+                else:  # TV Show
+                    result = self.tmdb_client.find_best_tv_match(media_info["title"], media_info["year"],
+                                                                 self.use_episode_titles)
+
+                if result:
+                    # Parse the release/first-air year once per match rather than per file
+                    date = result.get("release_date") or result.get("first_air_date")
+                    if date:
+                        result["_year"] = int(date[:4])
+
+                # Lookups that raised are not cached so a transient API error can be retried
+                self._tmdb_match_cache[cache_key] = result
 
             if result:
                 # Use appropriate field name for movies vs TV shows
                 display_name = result.get("title") or result.get("name", "Unknown")
-                self.logger.debug(f"Found TMDb match: {display_name}")
+                self.logger.debug("Found TMDb match: %s", display_name)
                 return result
             else:
                 self.logger.warning(f"No TMDb match found for: {media_info['title']}")
@@ -254,13 +416,17 @@ class MediaRenamer:
                 return
 
             # Fetch the episode details from TMDb
-            episode_data = self.tmdb_client.get_episode_info(
-                tmdb_id,
-                season,
-                episode,
-                episode_title=media_info.get("episode_title"),
-                use_episode_title=self.use_episode_titles
-            )
+            if self.use_episode_titles:
+                # Title matching may need to search other seasons
+                episode_data = self.tmdb_client.get_episode_info(
+                    tmdb_id,
+                    season,
+                    episode,
+                    episode_title=media_info.get("episode_title"),
+                    use_episode_title=True
+                )
+            else:
+                episode_data = self._get_season_episode(tmdb_id, season, episode)
 
             if episode_data and "name" in episode_data:
                 original_title = media_info.get("episode_title", "")
@@ -283,12 +449,38 @@ class MediaRenamer:
                         media_info["episode"] = new_episode
                         self.logger.info(f"Updated episode from TMDb: {original_episode} -> {new_episode}")
             else:
-                self.logger.debug(f"Could not fetch episode title for S{season}E{episode} from TMDb")
+                self.logger.debug("Could not fetch episode title for S%sE%s from TMDb", season, episode)
 
         except Exception as e:
-            self.logger.debug(f"Failed to fetch episode title from TMDb: {e}")
+            self.logger.debug("Failed to fetch episode title from TMDb: %s", e)
             # Don't fail the entire operation if we can't fetch the episode title
 
+    def _get_season_episode(self, tmdb_id: int, season: int, episode: int) -> dict | None:
+        """Look up an episode from the cached season listing, fetching the season once."""
+        key = (tmdb_id, season)
+        with self._season_lock:
+            fetch_lock = self._season_fetch_locks.setdefault(key, threading.Lock())
+
+        # Workers needing the same season wait for the first fetch instead of repeating it
+        with fetch_lock:
+            episodes = self._season_cache.get(key)
+            if episodes is None:
+                try:
+                    episodes = self.tmdb_client.get_season(tmdb_id, season)
+                except TMDbError as e:
+                    if "404" not in str(e):
+                        raise
+                    self.logger.debug("Season %s not found for show ID %s", season, tmdb_id)
+                    episodes = {}
+                self._season_cache[key] = episodes
+
+        episode_data = episodes.get(episode)
+        if episode_data is None:
+            return None
+
+        # Same shape as get_episode_info: season/episode numbers reflect the episode found
+        return {**episode_data, "season_number": season, "episode_number": episode}
+
     @staticmethod
     def _format_new_path(media_info: dict, tmdb_data: dict, filepath: Path) -> Path:
         """Format the new path according to Plex conventions."""
@@ -299,7 +491,7 @@ class MediaRenamer:
             # Destination will be determined by file extension
             new_path = construct_movie_path(
                 tmdb_data["title"],
-                int(tmdb_data["release_date"][:4]) if tmdb_data.get("release_date") else media_info["year"],
+                tmdb_data.get("_year", media_info["year"]),
                 tmdb_id,
                 extension,
             )
@@ -307,7 +499,7 @@ class MediaRenamer:
             # Destination will be determined by file extension
             new_path = construct_tv_show_path(
                 tmdb_data["name"],
-                int(tmdb_data["first_air_date"][:4]) if tmdb_data.get("first_air_date") else media_info["year"],
+                tmdb_data.get("_year", media_info["year"]),
                 tmdb_id,
                 media_info["season"],
                 media_info["episode"],
@@ -317,31 +509,23 @@ class MediaRenamer:
 
         return new_path
 
-    def _move_to_destination(self, source_path: Path, new_path: Path, content_type: str) -> bool:
-        """Move file to appropriate destination based on file extension."""
-        extension = source_path.suffix.lower()
+    def _move_to_destination(self, source_path: Path, new_path: Path, content_type: str, extension: str) -> bool:
+        """Move file to appropriate destination based on its lowercased file extension."""
         is_mp4 = extension == ".mp4"
 
         if is_mp4:
             # MP4 files go directly to upload folder
-            destination_dir = Path(MEDIA_BASE_FOLDER, UPLOAD_FOLDER)
+            destination_dir = self._upload_dir
             self.logger.info(f"MP4 file detected, moving to upload folder: {destination_dir}")
         else:
             # Non-MP4 files go to transcode folder
-            destination_dir = Path(MEDIA_BASE_FOLDER, TRANSCODE_FOLDER)
+            destination_dir = self._transcode_dir
             self.logger.info(f"Non-MP4 file detected, moving to transcode folder: {destination_dir}")
 
         # Extract the relative path from new_path (remove the MEDIA_BASE_FOLDER prefix)
-        # new_path is like: ../media/Movies/Title (Year) {tmdb-id}/Title (Year) {tmdb-id}.ext
+        # new_path is like: <MEDIA_BASE_FOLDER>/Movies/Title (Year) {tmdb-id}/Title (Year) {tmdb-id}.ext
         # We want: Movies/Title (Year) {tmdb-id}/Title (Year) {tmdb-id}.ext
-        new_path_str = str(new_path)
-        # Remove the leading ../media/ from the path
-        if new_path_str.startswith("../media/"):
-            relative_path = Path(new_path_str[9:])  # Skip "../media/"
-        elif new_path_str.startswith("../"):
-            relative_path = Path(new_path_str[3:])  # Skip "../"
-        else:
-            relative_path = new_path
+        relative_path = new_path.relative_to(MEDIA_BASE_FOLDER)
 
         # Construct the full destination path: transcode/Movies/Title/file.ext
         destination_path = destination_dir / relative_path
@@ -350,7 +534,7 @@ class MediaRenamer:
             self.logger.info(f"DRY RUN: Would move {source_path} to {destination_path}")
             return True  # Dry run always "succeeds"
 
-        error_dir = create_error_directory(Path(MEDIA_BASE_FOLDER, ERROR_FOLDER), "renaming_errors")
+        error_dir = create_error_directory(self._error_dir_root, "renaming_errors")
         success = safe_move_with_backup(source_path, destination_path, error_dir)
 
         if success:
@@ -370,7 +554,7 @@ class MediaRenamer:
             self.logger.info(f"DRY RUN: Would move {filepath} to error directory")
             return False
 
-        error_dir = create_error_directory(Path(MEDIA_BASE_FOLDER, ERROR_FOLDER), "processing_errors")
+        error_dir = create_error_directory(self._error_dir_root, "processing_errors")
         error_destination = error_dir / filepath.name
 
         try:
@@ -381,7 +565,7 @@ class MediaRenamer:
             return False
 
 
-def main():
+def main(argv: list[str] | None = None) -> int:
     """Main entry point for the CLI."""
     parser = argparse.ArgumentParser(
         description="Plex media file renamer - handles parsing, TMDb lookup, and file organization",
@@ -393,6 +577,7 @@ def main():
    %(prog)s --dry-run                         # Preview changes without modifications
    %(prog)s --log-level DEBUG                 # Enable debug logging
    %(prog)s --use-episode-titles              # Use episode titles instead of S##E## numbers for TV shows
+   %(prog)s --max-concurrency 4               # Process 4 files at a time
         """,
     )
 
@@ -414,6 +599,13 @@ def main():
         help="Use episode titles instead of S##E## numbers for TV shows (useful when episode numbers are incorrect)",
     )
 
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=RENAME_WORKERS,
+        help=f"Number of files to process concurrently (default: {RENAME_WORKERS})",
+    )
+
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARN", "ERROR"],
@@ -421,13 +613,14 @@ def main():
         help="Logging level (default: INFO)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Create and run the media renamer
     renamer = MediaRenamer(
         dry_run=args.dry_run,
         log_level=args.log_level,
         use_episode_titles=getattr(args, "use_episode_titles", False),
+        max_concurrency=args.max_concurrency,
     )
 
     try:
@@ -439,6 +632,8 @@ def main():
         print(f"Error: {e}")
         sys.exit(1)
 
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -5,13 +5,15 @@ This package contains utilities specific to media renaming process.
 """
 
 from .formatter import construct_movie_path, construct_tv_show_path
-from .parser import parse_media_file
+from .parser import parse_filename_tokens, parse_media_file, parse_media_files
 from .tmdb_client import TMDbClient, TMDbError
 
 __all__ = [
     "construct_movie_path",
     "construct_tv_show_path",
+    "parse_filename_tokens",
     "parse_media_file",
+    "parse_media_files",
     "TMDbClient",
     "TMDbError",
 ]
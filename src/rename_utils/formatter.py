@@ -6,20 +6,25 @@ Plex naming conventions for both movies and TV shows.
 """
 
 import logging
-import re
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from common.constants import MEDIA_BASE_FOLDER
+try:
+    from ..common.constants import MEDIA_BASE_FOLDER
+except ImportError:
+    # Installed as top-level packages rather than imported through src
+    from common.constants import MEDIA_BASE_FOLDER
 
 logger = logging.getLogger(__name__)
 
+# Delete-map for characters that are problematic in filenames
+_INVALID_CHARS_TABLE = str.maketrans("", "", '<>:"/\\|?*')
+
 
 def _sanitize_filename(text: str) -> str:
     """Remove characters that are problematic in filenames."""
-    invalid_chars = r'[<>:"/\\|?*]'
-    return re.sub(invalid_chars, "", text).strip()
+    return text.translate(_INVALID_CHARS_TABLE).strip()
 
 
 def _is_show_still_running(tmdb_data: dict) -> bool:
@@ -76,7 +81,7 @@ def _format_movie_filename(title: str, year: int, tmdb_id: int, extension: str)
     # Format: Title (Year) {tmdb-id}.ext
     filename = f"{clean_title} ({year}) {{tmdb-{tmdb_id}}}{extension}"
 
-    logger.debug(f"Formatted movie filename: {filename}")
+    logger.debug("Formatted movie filename: %s", filename)
     return filename
 
 
@@ -102,7 +107,7 @@ def _format_episode_filename(
     clean_episode_title = _sanitize_filename(clean_episode_title)
     filename = f"{clean_title} - S{season_str}E{episode_str} - {clean_episode_title}{extension}"
 
-    logger.debug(f"Formatted TV filename: {filename}")
+    logger.debug("Formatted TV filename: %s", filename)
     return filename
 
 
@@ -119,7 +124,7 @@ def _format_movie_folder_name(title: str, year: int, tmdb_id: int) -> str:
     # Use TMDB ID for consistency (Plex prefers TMDB over IMDB)
     folder_name = f"{clean_title} ({year}) {{tmdb-{tmdb_id}}}"
 
-    logger.debug(f"Formatted movie folder name: {folder_name}")
+    logger.debug("Formatted movie folder name: %s", folder_name)
     return folder_name
 
 
@@ -145,7 +150,7 @@ def _format_tv_show_folder_name(title: str, year: Optional[int], tmdb_id: int, i
         # For shows without clear year info, use just TMDB ID
         folder_name = f"{clean_title} {{tmdb-{tmdb_id}}}"
 
-    logger.debug(f"Formatted TV show folder name: {folder_name}")
+    logger.debug("Formatted TV show folder name: %s", folder_name)
     return folder_name
 
 
@@ -158,7 +163,7 @@ def _format_season_folder_name(season: int) -> str:
     season_str = f"{season:02d}"
     folder_name = f"Season {season_str}"
 
-    logger.debug(f"Formatted season folder name: {folder_name}")
+    logger.debug("Formatted season folder name: %s", folder_name)
     return folder_name
 
 
@@ -175,7 +180,7 @@ def construct_movie_path(
     # Create movie filename
     filename = _format_movie_filename(title, year, tmdb_id, extension)
     # Return path: /Movies/Movie Name (Year) {tmdb-id}/Movie Name (Year) {tmdb-id}.ext
-    return Path(MEDIA_BASE_FOLDER, 'Movies') / movie_folder_name / filename
+    return Path(MEDIA_BASE_FOLDER, 'Movies', movie_folder_name, filename)
 
 
 def construct_tv_show_path(
@@ -190,13 +195,12 @@ def construct_tv_show_path(
 ) -> Path:
     # Create show folder
     show_folder_name = _format_tv_show_folder_name(title, year, tmdb_id)
-    show_folder = Path(MEDIA_BASE_FOLDER, 'TV Shows') / show_folder_name
 
     # Create season folder
     season_folder_name = _format_season_folder_name(season)
-    season_folder = show_folder / season_folder_name
 
     # Create filename
     filename = _format_episode_filename(title, season, episode, episode_title, extension)
 
-    return season_folder / filename
+    # Return path: /TV Shows/Show Name (Year-) {tmdb-id}/Season XX/Show Name - SXXEXX - Title.ext
+    return Path(MEDIA_BASE_FOLDER, 'TV Shows', show_folder_name, season_folder_name, filename)
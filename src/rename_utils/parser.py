@@ -6,58 +6,129 @@ extracting information like series names, season/episode numbers, years,
 and episode titles for use in media processing and Plex naming.
 """
 
+import functools
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
-
-from common.constants import SEASON_EPISODE_REGEX, YEAR_REGEX, DATE_REGEXES, QUALITY_FORMATS_REGEX
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from ..common.constants import (
+        COMBINED_FILENAME_REGEX,
+        PARSE_PARALLEL_THRESHOLD,
+        QUALITY_FORMATS_REGEX,
+        SEASON_EPISODE_REGEX,
+        YEAR_REGEX,
+    )
+except ImportError:
+    # Installed as top-level packages rather than imported through src
+    from common.constants import (
+        COMBINED_FILENAME_REGEX,
+        PARSE_PARALLEL_THRESHOLD,
+        QUALITY_FORMATS_REGEX,
+        SEASON_EPISODE_REGEX,
+        YEAR_REGEX,
+    )
+
+# Patterns used on every parsed file, compiled once at import
+# Separator characters mapped to spaces; translate avoids a regex pass for a fixed set
+_SEPARATORS_TABLE = str.maketrans("._-+", "    ")
+_WHITESPACE_RE = re.compile(r"\s+")
+_INVALID_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_PAREN_YEAR_RE = re.compile(r"\(((?:19|20)\d{2})\)")
+_BRACKETED_RE = re.compile(r"\[.*?]")
+_PAREN_CONTENT_RE = re.compile(r"\s*\([^)]*\)")
+_CURLY_ID_RE = re.compile(r"\s*\{[a-z0-9\-:]+}")
+# Release group / encode tags that mark the rest of a directory name as noise
+_RELEASE_SUFFIX_RE = re.compile(r"\.(?:ELiTE|NTb|EZTV|x265|1080p).*")
+# Bracketed tags, release tags and season-specific markers that show a directory is
+# really a release name rather than a clean show title
+_FILENAME_INDICATORS_RE = re.compile(r"\[.*?]|\.(?:ELiTE|NTb|EZTV|x265|1080p)|\.S25.|S25\.")
+# Directory names too generic to be a show title (compared lower-cased)
+_GENERIC_SHOW_TITLES = frozenset({"tv shows", "season", "episodes"})
+# Cheap pre-check: a filename without an "S<digit>" pair cannot hold an SXXEYY token
+_SE_HINT_RE = re.compile(r"s\d", re.IGNORECASE)
+_PART_PREFIX_RE = re.compile(r"^(Part|Pt)\s*\d+")
+_GENERIC_SEGMENT_RE = re.compile(r"(?:S\d+E\d+|Season\s+\d+|Episode\s+\d+)")  # Used with match()
+
+# Tech tokens stripped from guessed titles, as one alternation so the title is scanned once
+_NOISY_RE = re.compile(
+    r"\b(?:"
+    r"S\d{1,2}E\d{1,2}"  # Season/episode
+    r"|1080p|720p|480p|2160p|4k"  # Resolution
+    r"|WEB[-\s]?DL|BluRay|DVDRip"  # Source
+    r"|x264|x265|h\.264|h\.265"  # Codec
+    r"|DDP?\d*\.?\d*|AAC|AC3"  # Audio
+    r"|AMZN|NF|HBO|HULU"  # Streaming services
+    r"|NTb|ELiTE"  # Release groups
+    r")\b"
+    r"|\[[^\]]*\]"  # Bracketed tags (including empty brackets)
+    r"|\{[^}]+\}",  # Curly bracketed tags
+    re.IGNORECASE,
+)
+
+# Date-based: Show YYYY-MM-DD - Title (the only episode-title pattern without an SXXEYY token)
+_DATE_EPISODE_TITLE_RE = re.compile(r".+\s*(\d{4})[-_.]\s*(\d{1,2})[-_.]\s*(\d{1,2})\s*[-_–—]\s*(.+)$")
+_EPISODE_TITLE_PATTERNS = [
+    # Standard: Show - SXXEYY - Title
+    re.compile(r"[Ss]\d{1,2}[Ee]\d{1,2}\s*[-_–—]\s*(.+)$"),
+    # Show SXXEYY Title (no dash)
+    re.compile(r"[Ss]\d{1,2}[Ee]\d{1,2}\s+(.+)$"),
+    # Title - Show SXXEYY (reversed)
+    re.compile(r"(.+)\s*[-_–—]\s*[Ss]\d{1,2}[Ee]\d{1,2}$"),
+    _DATE_EPISODE_TITLE_RE,
+    # Simple format: Title SXXEYY
+    re.compile(r"(.+)\s*[Ss]\d{1,2}[Ee]\d{1,2}$"),
+]
+# Characters that may separate an SXXEYY token from the episode title after it
+_TITLE_SEPARATORS = " -_–—"
 
 
 ### Internal helper functions ###
 def _normalize_text(text: str) -> str:
     """Normalize text by replacing common separators and removing extra whitespace."""
-    separators = r"[._\-\+]"
-    text = re.sub(separators, " ", text)
-    text = re.sub(r"\s+", " ", text)
+    text = _WHITESPACE_RE.sub(" ", text.translate(_SEPARATORS_TABLE))
     return text.strip()
 
 
 def _sanitize_filename(text: str) -> str:
     """Remove characters that are problematic in filenames."""
-    invalid_chars = r'[<>:"/\\|?*]'
-    return re.sub(invalid_chars, "", text).strip()
+    return _INVALID_CHARS_RE.sub("", text).strip()
 
 
-def _parse_tv_filename(filename: str) -> Tuple[Optional[int], Optional[int]]:
-    """Extract season and episode numbers from a TV show filename."""
-    match = SEASON_EPISODE_REGEX.search(filename)
+def _parse_tv_filename(tokens: Dict[str, re.Match]) -> Tuple[Optional[int], Optional[int]]:
+    """Extract season and episode numbers from scanned filename tokens."""
+    match = tokens.get("se")
     if match:
-        season = int(match.group(1))
-        episode = int(match.group(2))
+        season = int(match.group("season"))
+        episode = int(match.group("episode"))
         return season, episode
     return None, None
 
 
-def _parse_date_in_filename(filename: str) -> Tuple[Optional[str], Optional[int]]:
-    """Extract date from filename for date-based TV shows."""
-    for rx in DATE_REGEXES:
-        m = rx.search(filename)
-        if m:
-            y, mo, d = m.group(1), m.group(2), m.group(3)
-            return f"{y}-{mo}-{d}", int(y)
+def _parse_date_in_filename(tokens: Dict[str, re.Match]) -> Tuple[Optional[str], Optional[int]]:
+    """Extract date from scanned filename tokens for date-based TV shows."""
+    m = tokens.get("date")
+    if m:
+        y, mo, d = m.group("date_year", "date_month", "date_day")
+        return f"{y}-{mo}-{d}", int(y)
     return None, None
 
 
-def _extract_year_from_stem(stem: str) -> Optional[int]:
-    """Extract the first 4-digit year between 1900-2099 from a filename stem."""
-    for match in YEAR_REGEX.finditer(stem):
-        if match:
-            year = int(match.group(0))
-            if 1900 <= year <= 2099:
-                return year
-    return None
+def _extract_year_from_stem(stem: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Extract the first standalone 4-digit year between 1900-2099 from a filename stem.
+
+    Returns (year, start offset of the year in the stem), or (None, None).
+    """
+    match = YEAR_REGEX.search(stem)
+    if match:
+        return int(match.group()), match.start()
+    return None, None
 
 
+@functools.lru_cache(maxsize=4096)
 def _guess_title_and_year_from_stem(stem: str) -> Tuple[str, Optional[int]]:
     """
     Extract human-readable title and year from a noisy filename stem.
@@ -73,24 +144,15 @@ def _guess_title_and_year_from_stem(stem: str) -> Tuple[str, Optional[int]]:
     # First try parentheses style: Title (2024) - most common for movies
     year = None
     title_part = s
-    m = re.search(r"\((19|20)\d{2}\)", s)
+    m = _PAREN_YEAR_RE.search(s)
     if m:
-        year_match = re.search(r"(19|20)\d{2}", m.group(0))
-        if year_match:
-            year = int(year_match.group(0))
+        year = int(m.group(1))
         title_part = s[: m.start()].strip()
     else:
-        # Otherwise pick the last 4-digit year token between 1900-2099
-        year = _extract_year_from_stem(s)
+        # Otherwise pick the first 4-digit year token between 1900-2099 and split the title there
+        year, year_start = _extract_year_from_stem(s)
         if year:
-            # Find the position of year to split the title
-            year_match = None
-            for match in YEAR_REGEX.finditer(s):
-                if int(match.group(0)) == year:
-                    year_match = match
-                    break
-            if year_match:
-                title_part = s[: year_match.start()].strip()
+            title_part = s[:year_start].strip()
 
     # Remove season/episode patterns from title (for TV shows that fall through)
     title_part = SEASON_EPISODE_REGEX.sub("", title_part)
@@ -99,32 +161,35 @@ def _guess_title_and_year_from_stem(stem: str) -> Tuple[str, Optional[int]]:
     title_part = QUALITY_FORMATS_REGEX.sub("", title_part)
 
     # Remove common noisy patterns
-    noisy_patterns = [
-        r"\b(S\d{1,2}E\d{1,2})\b",  # Season/episode
-        r"\b(1080p|720p|480p|2160p|4k)\b",  # Resolution
-        r"\b(WEB[-\s]?DL|BluRay|DVDRip)\b",  # Source
-        r"\b(x264|x265|h\.264|h\.265)\b",  # Codec
-        r"\b(DDP?\d*\.?\d*|AAC|AC3)\b",  # Audio
-        r"\b(AMZN|NF|HBO|HULU)\b",  # Streaming services
-        r"\b(NTb|ELiTE)\b",  # Release groups
-        r"\[[^\]]+\]",  # Square bracketed tags
-        r"\{[^}]+\}",  # Curly bracketed tags
-        r"\[.*?\]",  # Generic bracketed content
-    ]
-
-    for pattern in noisy_patterns:
-        title_part = re.sub(pattern, "", title_part, flags=re.IGNORECASE)
-
-    title_part = re.sub(r"\s+", " ", title_part).strip(" -_()")
+    title_part = _NOISY_RE.sub("", title_part)
+
+    title_part = _WHITESPACE_RE.sub(" ", title_part).strip(" -_()")
 
     # Convert to title case if all caps
     if title_part.isupper():
         title_part = title_part.title()
 
-    return title_part.strip(), year
+    # Whitespace was collapsed and the ends stripped above, and title() adds none
+    return title_part, year
+
+
+def _clean_episode_title_candidate(title_candidate: str) -> Optional[str]:
+    """Tidy a matched episode-title segment, returning None if it is empty or looks like a tag."""
+    title_candidate = title_candidate.strip(" -_")
+    # Clean common prefixes/suffixes
+    title_candidate = _PART_PREFIX_RE.sub("", title_candidate)
+    title_candidate = _BRACKETED_RE.sub("", title_candidate)
+    if (
+            title_candidate
+            and not SEASON_EPISODE_REGEX.search(title_candidate)
+            and not QUALITY_FORMATS_REGEX.search(title_candidate)
+    ):
+        return title_candidate
+    return None
 
 
-def _extract_episode_title_from_filename(stem: str) -> Optional[str]:
+@functools.lru_cache(maxsize=4096)
+def _extract_episode_title_from_filename(stem: str, se_end: Optional[int] = None) -> Optional[str]:
     """
     Extract episode title from a TV show filename stem.
 
@@ -133,49 +198,136 @@ def _extract_episode_title_from_filename(stem: str) -> Optional[str]:
         "Ghosts - S01E01 - Pilot" -> "Pilot"
         "The Office - S03E04 - The Coup" -> "The Coup"
     Returns None if no obvious title segment exists.
+
+    se_end is the end offset of the first SXXEYY token in the stem when the
+    caller has already found it, which saves searching for it again.
     """
-    s = _normalize_text(stem)
+    if se_end is not None and se_end <= len(stem):
+        s = None
+        # Separators map one-to-one and the token ends in a digit, so normalizing only
+        # the text after it gives the same tail as slicing the normalized stem
+        tail = _WHITESPACE_RE.sub(" ", stem[se_end:].translate(_SEPARATORS_TABLE)).rstrip()
+    else:
+        s = _normalize_text(stem)
+        se_match = SEASON_EPISODE_REGEX.search(s)
+        tail = None if se_match is None else s[se_match.end():]
 
-    # Try multiple patterns for episode titles
-    patterns = [
-        # Standard: Show - SXXEYY - Title
-        r"[Ss]\d{1,2}[Ee]\d{1,2}\s*[-_–—]\s*(.+)$",
-        # Show SXXEYY Title (no dash)
-        r"[Ss]\d{1,2}[Ee]\d{1,2}\s+(.+)$",
-        # Title - Show SXXEYY (reversed)
-        r"(.+)\s*[-_–—]\s*[Ss]\d{1,2}[Ee]\d{1,2}$",
-        # Date-based: Show YYYY-MM-DD - Title
-        r".+\s*(\d{4})[-_.]\s*(\d{1,2})[-_.]\s*(\d{1,2})\s*[-_–—]\s*(.+)$",
-        # Simple format: Title SXXEYY
-        r"(.+)\s*[Ss]\d{1,2}[Ee]\d{1,2}$",
-    ]
+    if tail is None:
+        # Every other pattern needs an SXXEYY token
+        patterns = [_DATE_EPISODE_TITLE_RE]
+    else:
+        # Common case "Show SXXEYY Title": the title is whatever follows the token
+        if tail[:1] and tail[0] in _TITLE_SEPARATORS:
+            title_candidate = _clean_episode_title_candidate(tail.lstrip(_TITLE_SEPARATORS))
+            if title_candidate:
+                return _sanitize_filename(title_candidate)
+        patterns = _EPISODE_TITLE_PATTERNS
+        if s is None:
+            s = _normalize_text(stem)
 
+    # Try multiple patterns for episode titles
     for pattern in patterns:
-        m = re.search(pattern, s)
+        m = pattern.search(s)
         if m:
-            title_candidate = m.group(1).strip(" -_")
-            # Clean common prefixes/suffixes
-            title_candidate = re.sub(r"^(Part|Pt)\s*\d+", "", title_candidate)
-            title_candidate = re.sub(r"\[.*?]", "", title_candidate)
-            if (
-                    title_candidate
-                    and not SEASON_EPISODE_REGEX.search(title_candidate)
-                    and not QUALITY_FORMATS_REGEX.search(title_candidate)
-            ):
+            title_candidate = _clean_episode_title_candidate(m.group(1))
+            if title_candidate:
                 return _sanitize_filename(title_candidate)
 
     # Fallback: try to extract from segments separated by dashes
-    parts = [p.strip() for p in s.split(" - ") if p.strip()]
-    for part in parts:
-        if part and not SEASON_EPISODE_REGEX.search(part) and not QUALITY_FORMATS_REGEX.search(part):
-            # Check if this could be a title (not a number, not season/episode pattern)
-            if not re.search(r"^(S\d+E\d+|Season\s+\d+|Episode\s+\d+)", part):
-                return _sanitize_filename(part)
+    for part in s.split(" - "):
+        part = part.strip()
+        # Check if this could be a title (not a number, not season/episode pattern)
+        if part and not (
+                SEASON_EPISODE_REGEX.search(part)
+                or QUALITY_FORMATS_REGEX.search(part)
+                or _GENERIC_SEGMENT_RE.match(part)
+        ):
+            return _sanitize_filename(part)
 
     return None
 
 
+# Episodes of a season share their directories, so the directory-derived show
+# name is computed once per directory rather than once per file
+@functools.lru_cache(maxsize=4096)
+def _find_show_dir(parts: Tuple[str, ...], anchored: bool) -> str:
+    """
+    Walk up from a file's directory to the show folder (not a season/episode folder).
+
+    Takes the directory's path components (Path.parts) and whether the first
+    one is an anchor such as "/" or a drive, which is never a show folder.
+    """
+    first = 1 if anchored else 0
+    # Index of the first component under which everything counts as a show folder
+    tv_shows_index = next((i for i, part in enumerate(parts) if "TV Shows" in part), len(parts))
+
+    # Walk up the directory tree to find show folder (not season/episode folder)
+    for i in range(len(parts) - 1, first - 1, -1):
+        name = parts[i]
+
+        # Check if current directory looks like a season/episode folder
+        if (
+                SEASON_EPISODE_REGEX.search(name)
+                or QUALITY_FORMATS_REGEX.search(name)
+                or _BRACKETED_RE.search(name)
+                or ".ELiTE" in name  # Release groups, as plain substring tests
+                or ".NTb" in name
+                or ".EZTV" in name
+        ):
+            # Skip this, go up one level
+            continue
+
+        # Check if this might be the show folder
+        # Good indicators: sits under "TV Shows" or isn't a "Season N" folder
+        if tv_shows_index < i or not name.lower().startswith("season "):
+            return name
+
+    # Fallback to parent directory name if show folder not found
+    return parts[-1] if len(parts) > first else ""
+
+
+@functools.lru_cache(maxsize=4096)
+def _derive_show_title(show_dir: str) -> Tuple[str, Optional[int]]:
+    """Clean a show directory name into (title, year), parsing it as a filename if it looks like one."""
+    # Clean up show directory name (remove things like "(US)" etc.)
+    show_title = _PAREN_CONTENT_RE.sub("", show_dir).strip()
+    # Also clean up brackets and other patterns
+    show_title = _BRACKETED_RE.sub("", show_title).strip()
+    # Remove IDs in curly braces (IMDB, TMDB, etc.)
+    show_title = _CURLY_ID_RE.sub("", show_title).strip()
+    # Clean up quality tags and release groups from show directory
+    show_title = QUALITY_FORMATS_REGEX.sub("", show_title)
+    # Each tag truncates the name, so one pass cutting at the earliest tag is equivalent
+    show_title = _RELEASE_SUFFIX_RE.sub("", show_title)
+    show_title = show_title.strip()
+
+    # Check if show directory looks like a filename (contains quality tags, etc.)
+    show_dir_is_filename = (
+            SEASON_EPISODE_REGEX.search(show_dir)
+            or QUALITY_FORMATS_REGEX.search(show_dir)
+            or _FILENAME_INDICATORS_RE.search(show_dir)
+    )
+
+    # Use show directory title unless it's clearly a filename pattern or generic
+    if show_dir_is_filename or show_title.lower() in _GENERIC_SHOW_TITLES:
+        return _guess_title_and_year_from_stem(show_dir)  # Treat as potential filename
+    return show_title, None  # Use directory name as title
+
+
 ### Public functions ###
+def parse_filename_tokens(filename: str) -> Dict[str, re.Match]:
+    """
+    Scan a filename once and return the first match for each token kind.
+
+    Keys are the named groups of COMBINED_FILENAME_REGEX: "date", "se",
+    "tmdb", "year" and "quality".
+    """
+    tokens = {}
+    for match in COMBINED_FILENAME_REGEX.finditer(filename):
+        tokens.setdefault(match.lastgroup, match)
+    return tokens
+
+
 def parse_media_file(filepath: Path) -> dict:
     """
     Parse a media file and extract all relevant metadata.
@@ -189,87 +341,26 @@ def parse_media_file(filepath: Path) -> dict:
         - episode_title: Episode title (TV only, if available)
         - date_str: Date string for date-based shows (if applicable)
     """
-    stem = filepath.stem
-    filename = filepath.name
+    # Split the path once and work on its string components from here on
+    parts = filepath.parts
+    filename = parts[-1]
+    dot = filename.rfind(".")
+    stem = filename[:dot] if 0 < dot < len(filename) - 1 else filename  # Same rule as Path.stem
+
+    # Single pass over the filename for season/episode and date tokens; the tokens
+    # only matter for TV files, so filenames that cannot be one skip the scan
+    tokens = parse_filename_tokens(filename) if _SE_HINT_RE.search(filename) else {}
 
     # Check if it's a TV show by looking for season/episode patterns
-    season, episode = _parse_tv_filename(filename)
+    season, episode = _parse_tv_filename(tokens)
 
     if season is not None and episode is not None:
-        # TV Show - detect directory structure to find proper show name
-        current_path = filepath
-        show_dir = None
-
-        # Walk up the directory tree to find show folder (not season/episode folder)
-        current = current_path.parent
-        while current and current.name != current.root:
-            # Check if current directory looks like a season/episode folder
-            if (
-                    SEASON_EPISODE_REGEX.search(current.name)
-                    or QUALITY_FORMATS_REGEX.search(current.name)
-                    or re.search(r"\[.*?]", current.name)
-                    or re.search(r"\.(ELiTE|NTb|EZTV)", current.name)
-            ):
-                # Skip this, go up one level
-                current = current.parent
-                continue
-
-            # Check if this might be the show folder
-            # Good indicators: contains "TV Shows" or typical show naming
-            if (
-                    "TV Shows" in str(current.parent)
-                    or not SEASON_EPISODE_REGEX.search(current.name)
-                    and not QUALITY_FORMATS_REGEX.search(current.name)
-                    and not re.search(r"\[.*?]", current.name)
-                    and not re.search(r"\.(ELiTE|NTb|EZTV)", current.name)
-                    and not current.name.lower().startswith("season ")
-            ):
-                show_dir = current.name
-                break
-
-            current = current.parent
-
-        # Fallback to parent directory name if show folder not found
-        if not show_dir:
-            show_dir = filepath.parent.name
-
-        # Clean up show directory name (remove things like "(US)" etc.)
-        show_title = re.sub(r"\s*\([^)]*\)", "", show_dir).strip()
-        # Also clean up brackets and other patterns
-        show_title = re.sub(r"\[.*?]", "", show_title).strip()
-        # Remove IDs in curly braces (IMDB, TMDB, etc.)
-        show_title = re.sub(r"\s*\{[a-z0-9\-:]+}", "", show_title).strip()
-        # Clean up quality tags and release groups from show directory
-        show_title = QUALITY_FORMATS_REGEX.sub("", show_title)
-        show_title = re.sub(r"\.ELiTE.*", "", show_title)
-        show_title = re.sub(r"\.NTb.*", "", show_title)
-        show_title = re.sub(r"\.EZTV.*", "", show_title)
-        show_title = re.sub(r"\.x265.*", "", show_title)
-        show_title = re.sub(r"\.1080p.*", "", show_title)
-        show_title = show_title.strip()
-
-        # Check if show directory looks like a filename (contains quality tags, etc.)
-        show_dir_is_filename = (
-                SEASON_EPISODE_REGEX.search(show_dir)
-                or QUALITY_FORMATS_REGEX.search(show_dir)
-                or re.search(r"\[.*?]", show_dir)  # Brackets
-                or re.search(r"\.ELiTE.*", show_dir)
-                or re.search(r"\.NTb.*", show_dir)
-                or re.search(r"\.EZTV.*", show_dir)
-                or re.search(r"\.1080p.*", show_dir)
-                or re.search(r"\.x265.*", show_dir)
-                or re.search(r"\.S25.", show_dir)  # Season-specific pattern
-                or "S25." in show_dir  # Season-specific pattern
-        )
-
-        # Use show directory title unless it's clearly a filename pattern or generic
-        if show_dir_is_filename or show_title.lower() in ["tv shows", "season", "episodes"]:
-            title, year = _guess_title_and_year_from_stem(show_dir)  # Treat as potential filename
-        else:
-            title, year = show_title, None  # Use directory name as title
-
-        episode_title = _extract_episode_title_from_filename(stem)
-        date_str, date_year = _parse_date_in_filename(filename)
+        # TV Show - derive the show name from the directory structure
+        title, year = _derive_show_title(_find_show_dir(parts[:-1], bool(filepath.anchor)))
+
+        # Reuse the SXXEYY match from the token scan instead of searching the stem again
+        episode_title = _extract_episode_title_from_filename(stem, tokens["se"].end())
+        date_str, date_year = _parse_date_in_filename(tokens)
 
         # Use date year if no year found in title
         if year is None and date_year is not None:
@@ -297,3 +388,22 @@ def parse_media_file(filepath: Path) -> dict:
             "episode_title": None,
             "date_str": None,
         }
+
+
+def parse_media_files(paths: Iterable[Path]) -> List[dict]:
+    """
+    Parse many media files, in worker processes for large batches.
+
+    Parsing is pure CPU work under the GIL, so batches of at least
+    PARSE_PARALLEL_THRESHOLD files are spread over a process pool; smaller ones
+    are parsed in-process, where spawning workers would cost more than it saves.
+    Results are returned in input order, as from parse_media_file.
+    """
+    paths = list(paths)
+    if len(paths) < PARSE_PARALLEL_THRESHOLD:
+        return [parse_media_file(path) for path in paths]
+
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_media_file, paths, chunksize=chunksize))
@@ -6,14 +6,59 @@ handling search requests, error handling, and response parsing.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
-
-import requests
-
-from common.constants import TMDB_API_KEY, TMDB_BASE_URL
+import random
+import re
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
+
+# requests (with urllib3 and its charset detection) is imported when a client is
+# created, so CLI startup and --help do not pay for it
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+try:
+    from ..common import constants
+    from ..common.constants import (
+        TMDB_APPEND_LIMIT,
+        TMDB_BACKOFF_MAX,
+        TMDB_BASE_URL,
+        TMDB_CACHE_AIRING_TTL,
+        TMDB_CACHE_DIR,
+        TMDB_CACHE_SEARCH_TTL,
+        TMDB_CACHE_TTL,
+        TMDB_MAX_RETRIES,
+    )
+    from ..common.rate_limit import TMDB_BUCKET
+    from ..common.tmdb_cache import TMDbCache
+except ImportError:
+    # Installed as top-level packages rather than imported through src
+    from common import constants
+    from common.constants import (
+        TMDB_APPEND_LIMIT,
+        TMDB_BACKOFF_MAX,
+        TMDB_BASE_URL,
+        TMDB_CACHE_AIRING_TTL,
+        TMDB_CACHE_DIR,
+        TMDB_CACHE_SEARCH_TTL,
+        TMDB_CACHE_TTL,
+        TMDB_MAX_RETRIES,
+    )
+    from common.rate_limit import TMDB_BUCKET
+    from common.tmdb_cache import TMDbCache
 
 logger = logging.getLogger(__name__)
 
+# Trailing region tag on a show title, e.g. "Ghosts (US)" or "The Office UK"
+_REGION_SUFFIX_RE = re.compile(r"\s*(?:\(U[SK]\)|\bU[SK])\s*$")
+
 
 class TMDbError(Exception):
     """Base exception for TMDb API errors."""
@@ -36,30 +81,168 @@ class TMDbNotFoundError(TMDbError):
 class TMDbClient:
     """Client for interacting with The Movie Database API."""
 
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the TMDb client with an API key."""
-        self.api_key = api_key or TMDB_API_KEY
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True, pool_size: int = 10):
+        """
+        Initialize the TMDb client with an API key.
+
+        Args:
+            api_key: TMDb API key (defaults to the TMDB_API_KEY environment variable)
+            use_cache: Whether to cache responses on disk in TMDB_CACHE_DIR
+            pool_size: Keep-alive connections to hold open (at least the number of threads sharing the client)
+        """
+        # Read here rather than at import, so .env is only loaded when a client is built
+        self.api_key = api_key or constants.TMDB_API_KEY
         if not self.api_key:
             raise TMDbError("TMDb API key is required. Set TMDB_API_KEY environment variable.")
 
+        import requests
+        from urllib3.util.retry import Retry
+
         self.session = requests.Session()
         self.session.params = {"api_key": self.api_key}
+        # One pooled connection per concurrent caller: requests discards connections beyond
+        # the pool size, and every replacement costs a fresh TCP + TLS handshake.
+        # Connection errors and transient 5xx responses are retried by urllib3; 429s are
+        # left to _make_request, which backs off through the shared rate-limit bucket.
+        # Retry-After is ignored here, since urllib3 would otherwise retry (and sleep on)
+        # any 429 carrying it inside the worker thread, bypassing the bucket
+        retries = Retry(
+            total=TMDB_MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=("GET",),
+            respect_retry_after_header=False,
+        )
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount("https://", adapter)
+
+        self.cache: Optional[TMDbCache] = None
+        if use_cache:
+            try:
+                self.cache = TMDbCache(Path(TMDB_CACHE_DIR))
+            except Exception as e:
+                logger.warning(f"TMDb response cache disabled: {e}")
+
+        # In-process memo of details for this client's lifetime, so repeat lookups
+        # (every episode of a show) skip even the disk cache
+        self._details_memo: Dict[str, Dict[str, Any]] = {}
+
+        # Requests currently on the wire, so concurrent callers asking for the same
+        # endpoint and parameters wait on one HTTP call instead of each making their own
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_ttl(endpoint: str, data: Dict[str, Any]) -> int:
+        """
+        Pick how long a response stays fresh in the disk cache.
+
+        Search results change as titles are added to TMDb, and TV data can
+        change while a show is airing (new episodes, placeholder episode
+        titles), so both get a short TTL unless TMDb reports the show has
+        ended. Movie details are stable.
+        """
+        endpoint = endpoint.lstrip("/")
+        if endpoint.startswith("search/"):
+            return TMDB_CACHE_SEARCH_TTL
+        if endpoint.startswith("tv/") and data.get("in_production") is not False:
+            return TMDB_CACHE_AIRING_TTL
+        return TMDB_CACHE_TTL
+
+    def clear_cache(self) -> None:
+        """Drop all cached TMDb responses so the next lookups go to the API."""
+        self._details_memo.clear()
+        if self.cache is not None:
+            self.cache.clear()
+
+    @staticmethod
+    def _respect_rate_limit(response: "requests.Response") -> None:
+        """Stop sending requests until the window resets once TMDb reports none remaining."""
+        if response.headers.get("X-RateLimit-Remaining") != "0":
+            return
+        try:
+            reset_in = float(response.headers["X-RateLimit-Reset"]) - time.time()
+        except (KeyError, ValueError):
+            return
+        if reset_in > 0:
+            TMDB_BUCKET.pause(min(reset_in, TMDB_BACKOFF_MAX))
+
+    @staticmethod
+    def _retry_delay(response: "requests.Response", attempt: int) -> float:
+        """Seconds to wait before retrying a 429: Retry-After if given, else jittered exponential backoff."""
+        try:
+            delay = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            delay = 0.5 * 2 ** attempt * random.uniform(1.0, 1.5)
+        return min(delay, TMDB_BACKOFF_MAX)
 
     def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make a request to the TMDb API and handle errors."""
+        """Make a request to the TMDb API, sharing the result with identical concurrent requests."""
+        key = TMDbCache.make_key(endpoint, params)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            future.set_result(self._fetch(endpoint, params))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+        return future.result()
+
+    def _fetch(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fetch one TMDb response (disk cache first) and handle errors."""
+        import requests  # Already loaded by __init__; this only binds the name
+
         url = f"{TMDB_BASE_URL}/{endpoint.lstrip('/')}"
 
+        # Serve from the on-disk cache when fresh; keep a stale copy for ETag revalidation
+        cache_key = None
+        stale_data, etag = None, None
+        if self.cache is not None:
+            cache_key = TMDbCache.make_key(endpoint, params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("TMDb cache hit: %s", url)
+                return cached
+            stale_data, etag = self.cache.get_stale(cache_key)
+
         try:
-            logger.debug(f"TMDb API request: {url}")
-            if params:
+            logger.debug("TMDb API request: %s", url)
+            if params and logger.isEnabledFor(logging.DEBUG):
                 # Redact API key for logging
                 safe_params = {k: v for k, v in params.items() if k != "api_key"}
-                logger.debug(f"Request params: {safe_params}")
+                logger.debug("Request params: %s", safe_params)
+
+            headers = {"If-None-Match": etag} if etag else None
+            for attempt in range(TMDB_MAX_RETRIES + 1):
+                TMDB_BUCKET.acquire()
+                response = self.session.get(url, params=params, headers=headers, timeout=30)
+                self._respect_rate_limit(response)
+                if response.status_code != 429 or attempt == TMDB_MAX_RETRIES:
+                    break
+                delay = self._retry_delay(response, attempt)
+                logger.warning("TMDb rate limit hit, retrying in %.1fs: %s", delay, url)
+                # Pause the shared bucket so every worker backs off, not just this one
+                TMDB_BUCKET.pause(delay)
+
+            if response.status_code == 304 and stale_data is not None:
+                logger.debug("TMDb response not modified, reusing cached data: %s", url)
+                self.cache.touch(cache_key, expire=self._cache_ttl(endpoint, stale_data))
+                return stale_data
 
-            response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
 
-            data = response.json()
+            # orjson (optional) decodes large detail payloads several times faster;
+            # its JSONDecodeError is a ValueError like the stdlib one
+            data = orjson.loads(response.content) if orjson is not None else response.json()
 
             if "success" in data and not data["success"]:
                 logger.error(f"❌ TMDb API error: {data.get('status_message', 'Unknown error')}")
@@ -67,9 +250,14 @@ class TMDbClient:
 
             # Log response summary (not full data to avoid spam)
             if "results" in data:
-                logger.debug(f"TMDb response: {len(data['results'])} results found")
+                logger.debug("TMDb response: %d results found", len(data["results"]))
             else:
-                logger.debug(f"TMDb response: success")
+                logger.debug("TMDb response: success")
+
+            if cache_key is not None:
+                self.cache.set(
+                    cache_key, data, expire=self._cache_ttl(endpoint, data), etag=response.headers.get("ETag")
+                )
 
             return data
 
@@ -86,20 +274,22 @@ class TMDbClient:
         if year:
             params["year"] = str(year)
 
-        logger.info(f"Searching TMDb for movie: '{title}' ({year})")
+        logger.info("Searching TMDb for movie: '%s' (%s)", title, year)
         data = self._make_request("search/movie", params)
         results = data.get("results", [])
-        logger.info(f"TMDb returned {len(results)} movie results")
+        logger.info("TMDb returned %d movie results", len(results))
 
         # Log top results for debugging
         if results:
-            logger.debug(f"Top TMDb movie results:")
-            for i, result in enumerate(results[:3]):
-                logger.debug(
-                    f"  {i + 1}. {result.get('title')} ({result.get('release_date', 'Unknown')}) - ID: {result.get('id')}"
-                )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Top TMDb movie results:")
+                for i, result in enumerate(results[:3]):
+                    logger.debug(
+                        "  %d. %s (%s) - ID: %s",
+                        i + 1, result.get("title"), result.get("release_date", "Unknown"), result.get("id"),
+                    )
         else:
-            logger.warning(f"No TMDb movie results found for: '{title}' ({year})")
+            logger.warning("No TMDb movie results found for: '%s' (%s)", title, year)
 
         return results
 
@@ -109,32 +299,66 @@ class TMDbClient:
         if first_air_date_year:
             params["first_air_date_year"] = str(first_air_date_year)
 
-        logger.info(f"Searching TMDb for TV show: '{title}' ({first_air_date_year})")
+        logger.info("Searching TMDb for TV show: '%s' (%s)", title, first_air_date_year)
         data = self._make_request("search/tv", params)
         results = data.get("results", [])
-        logger.info(f"TMDb returned {len(results)} TV show results")
+        logger.info("TMDb returned %d TV show results", len(results))
 
         # Log top results for debugging
         if results:
-            logger.debug(f"Top TMDb TV results:")
-            for i, result in enumerate(results[:3]):
-                logger.debug(
-                    f"  {i + 1}. {result.get('name')} ({result.get('first_air_date', 'Unknown')}) - ID: {result.get('id')}"
-                )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Top TMDb TV results:")
+                for i, result in enumerate(results[:3]):
+                    logger.debug(
+                        "  %d. %s (%s) - ID: %s",
+                        i + 1, result.get("name"), result.get("first_air_date", "Unknown"), result.get("id"),
+                    )
         else:
-            logger.warning(f"No TMDb TV results found for: '{title}' ({first_air_date_year})")
+            logger.warning("No TMDb TV results found for: '%s' (%s)", title, first_air_date_year)
 
         return results
 
     def get_movie_details(self, tmdb_id: int) -> Dict[str, Any]:
         """Get detailed information for a specific movie."""
-        logger.debug(f"Getting movie details for ID: {tmdb_id}")
-        return self._make_request(f"movie/{tmdb_id}")
+        return self._get_details(f"movie/{tmdb_id}")
 
     def get_tv_show_details(self, tmdb_id: int) -> Dict[str, Any]:
         """Get detailed information for a specific TV show."""
-        logger.debug(f"Getting TV show details for ID: {tmdb_id}")
-        return self._make_request(f"tv/{tmdb_id}")
+        return self._get_details(f"tv/{tmdb_id}")
+
+    def _get_details(self, endpoint: str) -> Dict[str, Any]:
+        """Fetch a details endpoint once per client and reuse the response."""
+        details = self._details_memo.get(endpoint)
+        if details is None:
+            logger.debug("Getting details for: %s", endpoint)
+            details = self._details_memo[endpoint] = self._make_request(endpoint)
+        return details
+
+    def get_season(self, tmdb_id: int, season_number: int) -> Dict[int, Dict[str, Any]]:
+        """Get every episode of a season in one request, keyed by episode number."""
+        logger.debug("Getting season %s for show ID: %s", season_number, tmdb_id)
+        season_data = self._make_request(f"tv/{tmdb_id}/season/{season_number}")
+        return {episode.get("episode_number"): episode for episode in season_data.get("episodes", [])}
+
+    def get_seasons(self, tmdb_id: int, season_numbers: List[int]) -> Dict[int, Dict[int, Dict[str, Any]]]:
+        """Get several seasons at once, keyed by season then episode number.
+
+        Seasons are fetched through the series endpoint with append_to_response,
+        which TMDb allows for up to 20 sub-requests per call.
+        """
+        seasons = {}
+        for start in range(0, len(season_numbers), TMDB_APPEND_LIMIT):
+            batch = season_numbers[start:start + TMDB_APPEND_LIMIT]
+            logger.debug("Getting seasons %s for show ID: %s", batch, tmdb_id)
+            data = self._make_request(
+                f"tv/{tmdb_id}", {"append_to_response": ",".join(f"season/{n}" for n in batch)}
+            )
+            for season_number in batch:
+                season_data = data.get(f"season/{season_number}") or {}
+                seasons[season_number] = {
+                    episode.get("episode_number"): episode for episode in season_data.get("episodes", [])
+                }
+        return seasons
 
     def get_tv_episode_details(self, tmdb_id: int, season_number: int, episode_number: int,
                                episode_title: Optional[str] = "") -> Dict[str, Any]:
@@ -144,38 +368,40 @@ class TMDbClient:
         the actual episode found (useful when searching by title across seasons).
         """
         original_season = season_number
-        original_episode = episode_number
+        episodes = None
 
         if episode_title != "":
-            logger.debug(f"Getting episode details for show ID {tmdb_id} with title '{episode_title}'")
+            logger.debug("Getting episode details for show ID %s with title '%s'", tmdb_id, episode_title)
             # Search for episode by title within the season
-            season_data = self._make_request(f"tv/{tmdb_id}/season/{season_number}")
-            episodes = season_data.get("episodes", [])
-            for episode in episodes:
-                if episode.get("name", "").lower() == episode_title.lower():
-                    episode_number = episode.get("episode_number")
-                    logger.debug(f"Found episode '{episode_title}' as S{season_number}E{episode_number}")
-                    break
+            episodes = self.get_season(tmdb_id, season_number)
+            match = self._find_episode_by_title(episodes, episode_title)
+            if match is not None:
+                episode_number = match
+                logger.debug("Found episode '%s' as S%sE%s", episode_title, season_number, episode_number)
             else:
                 logger.error(
                     f"Episode titled '{episode_title}' not found in season {original_season} of show ID {tmdb_id}, searching all seasons...")
                 # If not found in the specified season, search all seasons
                 tv_data = self.get_tv_show_details(tmdb_id)
-                for season in tv_data.get("seasons", []):
-                    season_num = season.get("season_number")
-                    season_data = self._make_request(f"tv/{tmdb_id}/season/{season_num}")
-                    episodes = season_data.get("episodes", [])
-                    for episode in episodes:
-                        if episode.get("name", "").lower() == episode_title.lower():
-                            episode_number = episode.get("episode_number")
-                            season_number = season_num
-                            logger.debug(f"Found episode '{episode_title}' as S{season_number}E{episode_number}")
-                            break
-                    else:
-                        continue
-                    break
-        logger.debug(f"Getting episode details for show ID {tmdb_id}, S{season_number}E{episode_number}")
-        episode_data = self._make_request(f"tv/{tmdb_id}/season/{season_number}/episode/{episode_number}")
+                season_numbers = [
+                    season.get("season_number") for season in tv_data.get("seasons", [])
+                    if season.get("season_number") != original_season
+                ]
+                for season_num, season_episodes in self.get_seasons(tmdb_id, season_numbers).items():
+                    match = self._find_episode_by_title(season_episodes, episode_title)
+                    if match is not None:
+                        episode_number = match
+                        season_number = season_num
+                        episodes = season_episodes
+                        logger.debug("Found episode '%s' as S%sE%s", episode_title, season_number, episode_number)
+                        break
+
+        logger.debug("Getting episode details for show ID %s, S%sE%s", tmdb_id, season_number, episode_number)
+        if episodes is not None and episode_number in episodes:
+            # The season listing already carries the episode, no need for a separate request
+            episode_data = dict(episodes[episode_number])
+        else:
+            episode_data = self._make_request(f"tv/{tmdb_id}/season/{season_number}/episode/{episode_number}")
 
         # Include the corrected season and episode numbers in the response
         episode_data["season_number"] = season_number
@@ -183,36 +409,47 @@ class TMDbClient:
 
         return episode_data
 
+    @staticmethod
+    def _find_episode_by_title(episodes: Dict[int, Dict[str, Any]], episode_title: str) -> Optional[int]:
+        """Return the number of the episode whose name matches the title, if any."""
+        wanted = episode_title.lower()
+        for episode in episodes.values():
+            if episode.get("name", "").lower() == wanted:
+                return episode.get("episode_number")
+        return None
+
     def find_best_movie_match(self, title: str, year: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """Find the best matching movie for a given title and year."""
         results = self.search_movie(title, year)
 
         if not results:
-            logger.warning(f"No TMDb results found for movie: '{title}' ({year})")
+            logger.warning("No TMDb results found for movie: '%s' (%s)", title, year)
             # Try alternative search without year
             if year:
-                logger.info(f"Retrying movie search without year filter: '{title}'")
+                logger.info("Retrying movie search without year filter: '%s'", title)
                 results = self.search_movie(title, None)
                 if results:
                     result = results[0]
                     logger.info(
-                        f"Using best match (no year): '{result.get('title')}' ({result.get('release_date')}) - ID: {result.get('id')}"
+                        "Using best match (no year): '%s' (%s) - ID: %s",
+                        result.get("title"), result.get("release_date"), result.get("id"),
                     )
                     return result
             return None
 
         # If we have a Year, prefer exact year matches
         if year:
-            exact_matches = [r for r in results if r.get("release_date", "").startswith(str(year))]
-            if exact_matches:
-                result = exact_matches[0]
-                logger.info(f"Found exact year match: '{result.get('title')}' ({result.get('release_date')})")
+            year_prefix = str(year)
+            result = next((r for r in results if (r.get("release_date") or "").startswith(year_prefix)), None)
+            if result is not None:
+                logger.info("Found exact year match: '%s' (%s)", result.get("title"), result.get("release_date"))
                 return result
 
         # Return the first (highest rated) result
         result = results[0]
         logger.info(
-            f"Using best match: '{result.get('title')}' ({result.get('release_date')}) - ID: {result.get('id')}"
+            "Using best match: '%s' (%s) - ID: %s",
+            result.get("title"), result.get("release_date"), result.get("id"),
         )
         return result
 
@@ -230,36 +467,36 @@ class TMDbClient:
         results = self.search_tv_show(title, year)
 
         if not results:
-            logger.warning(f"No TMDb results found for TV show: '{title}' ({year})")
+            logger.warning("No TMDb results found for TV show: '%s' (%s)", title, year)
 
-            # Try alternative search strategies
+            # Try alternative search strategies: the title without its region tag,
+            # then without spaces (each variant is only searched if it differs)
             alternative_titles = [
-                title.replace(" US", ""),  # Remove region suffix
-                title.replace(" (US)", ""),
-                title.replace(" UK", ""),
-                title.replace(" (UK)", ""),
-                title.replace(" ", ""),  # Remove spaces
+                _REGION_SUFFIX_RE.sub("", title).strip(),
+                title.replace(" ", ""),
             ]
 
-            for alt_title in alternative_titles:
-                if alt_title != title:
-                    logger.info(f"Trying alternative title: '{alt_title}'")
+            for alt_title in dict.fromkeys(alternative_titles):
+                if alt_title and alt_title != title:
+                    logger.info("Trying alternative title: '%s'", alt_title)
                     results = self.search_tv_show(alt_title, year)
                     if results:
                         result = results[0]
                         logger.info(
-                            f"Found match with alternative title: '{result.get('name')}' ({result.get('first_air_date')}) - ID: {result.get('id')}"
+                            "Found match with alternative title: '%s' (%s) - ID: %s",
+                            result.get("name"), result.get("first_air_date"), result.get("id"),
                         )
                         return result
 
             # Try without year filter
             if year:
-                logger.info(f"Retrying TV search without year filter: '{title}'")
+                logger.info("Retrying TV search without year filter: '%s'", title)
                 results = self.search_tv_show(title, None)
                 if results:
                     result = results[0]
                     logger.info(
-                        f"Using best match (no year): '{result.get('name')}' ({result.get('first_air_date')}) - ID: {result.get('id')}"
+                        "Using best match (no year): '%s' (%s) - ID: %s",
+                        result.get("name"), result.get("first_air_date"), result.get("id"),
                     )
                     return result
 
@@ -267,16 +504,17 @@ class TMDbClient:
 
         # If we have a Year, prefer exact year matches
         if year:
-            exact_matches = [r for r in results if r.get("first_air_date", "").startswith(str(year))]
-            if exact_matches:
-                result = exact_matches[0]
-                logger.info(f"Found exact year match: '{result.get('name')}' ({result.get('first_air_date')})")
+            year_prefix = str(year)
+            result = next((r for r in results if (r.get("first_air_date") or "").startswith(year_prefix)), None)
+            if result is not None:
+                logger.info("Found exact year match: '%s' (%s)", result.get("name"), result.get("first_air_date"))
                 return result
 
         # Return the first (highest rated) result
         result = results[0]
         logger.info(
-            f"Using best match: '{result.get('name')}' ({result.get('first_air_date')}) - ID: {result.get('id')}"
+            "Using best match: '%s' (%s) - ID: %s",
+            result.get("name"), result.get("first_air_date"), result.get("id"),
         )
         return result
 
@@ -290,6 +528,6 @@ class TMDbClient:
                 return self.get_tv_episode_details(tmdb_id, season_number, episode_number)
         except TMDbAPIError as e:
             if "404" in str(e):
-                logger.debug(f"Episode S{season_number}E{episode_number} not found for show ID {tmdb_id}")
+                logger.debug("Episode S%sE%s not found for show ID %s", season_number, episode_number, tmdb_id)
                 return None
             raise
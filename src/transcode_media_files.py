@@ -12,39 +12,86 @@ This script processes media files by:
 
 import argparse
 import concurrent.futures
+import os
 import signal
 import sys
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
-from src import MEDIA_BASE_FOLDER
-
-# Add src directory to Python path for imports
-sys.path.insert(0, str(Path(__file__).parent))
-
-from common import (
-    CONTENT_TYPE_MOVIES,
-    CONTENT_TYPE_TV,
-    DEFAULT_LOG_LEVEL,
-    ERROR_FOLDER,
-    TRANSCODE_FOLDER,
-    UPLOAD_FOLDER,
-    LOG_DIR,
-    WORKERS,
-    create_error_directory,
-    ensure_directory_exists,
-    safe_move_with_backup,
-    scan_media_files,
-    setup_logging,
-)
-from transcode_utils import (
-    VideoInfo,
-    cleanup_all_processes,
-    cleanup_transcoding_artifacts,
-    get_transcode_output_path,
-    needs_transcoding,
-    transcode_video,
-    validate_transcoded_file,
-)
+try:
+    from .common import (
+        CONTENT_TYPE_MOVIES,
+        CONTENT_TYPE_TV,
+        DEFAULT_LOG_LEVEL,
+        ERROR_FOLDER,
+        TRANSCODE_FOLDER,
+        UPLOAD_FOLDER,
+        LOG_DIR,
+        MEDIA_BASE_FOLDER,
+        TRANSCODE_SETTINGS,
+        WORKERS,
+        create_error_directory,
+        ensure_directory_exists,
+        safe_move_with_backup,
+        scan_media_files,
+        setup_logging,
+    )
+    from .transcode_utils import (
+        VideoInfo,
+        cleanup_all_processes,
+        cleanup_transcoding_artifacts,
+        estimate_transcoding_time,
+        get_transcode_output_path,
+        needs_transcoding,
+        transcode_video,
+        validate_transcoded_file,
+    )
+except ImportError:
+    # Installed as top-level packages rather than imported through src
+    from common import (
+        CONTENT_TYPE_MOVIES,
+        CONTENT_TYPE_TV,
+        DEFAULT_LOG_LEVEL,
+        ERROR_FOLDER,
+        TRANSCODE_FOLDER,
+        UPLOAD_FOLDER,
+        LOG_DIR,
+        MEDIA_BASE_FOLDER,
+        TRANSCODE_SETTINGS,
+        WORKERS,
+        create_error_directory,
+        ensure_directory_exists,
+        safe_move_with_backup,
+        scan_media_files,
+        setup_logging,
+    )
+    from transcode_utils import (
+        VideoInfo,
+        cleanup_all_processes,
+        cleanup_transcoding_artifacts,
+        estimate_transcoding_time,
+        get_transcode_output_path,
+        needs_transcoding,
+        transcode_video,
+        validate_transcoded_file,
+    )
+
+# Successful transcodes are logged as progress at most every few seconds or files
+_PROGRESS_LOG_INTERVAL = 2.0
+_PROGRESS_LOG_EVERY = 10
+
+
+@dataclass(slots=True)
+class FileInfo:
+    """A scanned file and its progress through the transcode pipeline."""
+
+    path: Path
+    content_type: str
+    needs_transcoding: bool = False
+    transcoded: bool = False
+    transcoded_path: Path | None = None
+    video_info: VideoInfo | None = None
 
 
 class MediaTranscoder:
@@ -55,6 +102,9 @@ class MediaTranscoder:
             dry_run: bool = False,
             log_level: str = DEFAULT_LOG_LEVEL,
             workers: int = WORKERS,
+            hw_encoder: bool = True,
+            probe_mp4: bool = False,
+            scratch_dir: str | None = None,
     ):
         """
         Initialize the Media Transcoder.
@@ -63,10 +113,26 @@ class MediaTranscoder:
             dry_run: Preview changes without making modifications
             log_level: Logging level
             workers: Number of worker processes
+            hw_encoder: Prefer a hardware video encoder when one is available
+            probe_mp4: Probe .mp4 files too instead of assuming they are compatible
+            scratch_dir: Local directory ffmpeg writes into before moving each output into place
         """
         self.dry_run = dry_run
         self.log_level = log_level
         self.workers = workers
+        # Split the cores between the concurrent ffmpeg jobs
+        self.transcode_settings = {
+            **TRANSCODE_SETTINGS,
+            "threads": max(1, (os.cpu_count() or 1) // workers),
+            "hw_encoder": hw_encoder and TRANSCODE_SETTINGS["hw_encoder"],
+            "trust_mp4_suffix": not probe_mp4 and TRANSCODE_SETTINGS["trust_mp4_suffix"],
+            "scratch_dir": scratch_dir or TRANSCODE_SETTINGS["scratch_dir"],
+        }
+
+        # Per-content-type folders, built once rather than for every file moved
+        content_types = (CONTENT_TYPE_MOVIES, CONTENT_TYPE_TV)
+        self._upload_dirs = {ct: Path(MEDIA_BASE_FOLDER, UPLOAD_FOLDER, ct) for ct in content_types}
+        self._transcode_dirs = {ct: Path(MEDIA_BASE_FOLDER, TRANSCODE_FOLDER, ct) for ct in content_types}
 
         # Set up logging
         self.logger = setup_logging(
@@ -114,17 +180,18 @@ class MediaTranscoder:
 
         try:
             # Phase 1: Scan and analyze transcoding needs
-            files_to_process, analysis_errors = self._scan_and_analyze(transcode_dir)
+            files_to_analyze, mp4_files, analysis_errors = self._scan_and_analyze(transcode_dir)
+            files_to_process = mp4_files + files_to_analyze
 
             if not files_to_process:
                 self.logger.info("No files to process")
                 return
 
-            self.logger.info(f"Found {len(files_to_process)} files to process")
+            self.logger.info(f"Found {len(files_to_process)} files to process ({len(mp4_files)} already MP4)")
             self.logger.info(f"Analysis errors: {analysis_errors}")
 
-            # Phase 2: Transcode files in parallel
-            self._parallel_transcode(files_to_process)
+            # Phase 2: Transcode files in parallel (trusted MP4s never need it)
+            self._parallel_transcode(files_to_analyze)
 
             # Phase 3: Move all files to upload folder
             for file_info in files_to_process:
@@ -136,7 +203,7 @@ class MediaTranscoder:
                     success = self._move_to_upload_folder(file_info)
                     if success:
                         files_moved_successfully += 1
-                        if file_info.get("transcoded", False):
+                        if file_info.transcoded:
                             files_actually_transcoded += 1
                         else:
                             files_that_didnt_need_transcoding += 1
@@ -144,8 +211,8 @@ class MediaTranscoder:
                         files_failed_to_move += 1
 
                 except Exception as e:
-                    self.logger.error(f"Failed to move file {file_info['path']}: {e}")
-                    self._handle_error(file_info["path"], str(e))
+                    self.logger.error(f"Failed to move file {file_info.path}: {e}")
+                    self._handle_error(file_info.path, str(e))
                     files_failed_to_move += 1
 
         except KeyboardInterrupt:
@@ -175,9 +242,12 @@ class MediaTranscoder:
 
     def _setup_directories(self) -> None:
         """Ensure all required directories exist."""
+        # Directories may have been removed since an earlier run in this process
+        ensure_directory_exists.cache_clear()
+        create_error_directory.cache_clear()
+
         directories = [
-            Path(MEDIA_BASE_FOLDER, UPLOAD_FOLDER) / CONTENT_TYPE_MOVIES,
-            Path(MEDIA_BASE_FOLDER, UPLOAD_FOLDER) / CONTENT_TYPE_TV,
+            *self._upload_dirs.values(),
             Path(MEDIA_BASE_FOLDER, ERROR_FOLDER),
         ]
 
@@ -185,11 +255,19 @@ class MediaTranscoder:
             ensure_directory_exists(directory)
             self.logger.debug(f"Ensured directory exists: {directory}")
 
-    def _scan_and_analyze(self, transcode_dir: Path) -> tuple[list[dict], int]:
-        """Scan for files and analyze transcoding needs."""
+    def _scan_and_analyze(self, transcode_dir: Path) -> tuple[list[FileInfo], list[FileInfo], int]:
+        """
+        Scan for files and analyze transcoding needs.
+
+        Returns (analyzed files, trusted MP4 files, analysis error count). Unless
+        the trust_mp4_suffix setting is off, MP4 files are assumed to need no
+        transcoding and are never probed.
+        """
         files_to_process = []
+        mp4_files = []
         analysis_errors = 0
 
+        scanned: list[tuple[Path, str]] = []
         for content_type in [CONTENT_TYPE_MOVIES, CONTENT_TYPE_TV]:
             content_dir = transcode_dir / content_type
 
@@ -199,66 +277,73 @@ class MediaTranscoder:
 
             self.logger.info(f"Scanning {content_type} from: {content_dir}")
 
-            for filepath in scan_media_files(content_dir):
-                if not self.running:
-                    break
-
-                try:
-                    file_info = self._analyze_file(filepath, content_type)
-                    if file_info:
-                        files_to_process.append(file_info)
-                    else:
-                        analysis_errors += 1
-
-                except Exception as e:
-                    self.logger.error(f"Failed to analyze file {filepath}: {e}")
-                    analysis_errors += 1
+            # Close the walk explicitly so a shutdown stops its directory reads right away
+            scan = scan_media_files(content_dir)
+            try:
+                for filepath in scan:
+                    if not self.running:
+                        break
+                    scanned.append((filepath, content_type))
+            finally:
+                scan.close()
+
+        # Each probe waits on an ffprobe child process, so many run at once to overlap
+        # their I/O. Probes are short and mostly waiting, so allow more of them than
+        # transcode workers
+        video_infos = VideoInfo.probe_many(
+            [filepath for filepath, _ in scanned],
+            concurrency=min(32, self.workers * 4),
+            trust_container=self.transcode_settings["trust_mp4_suffix"],
+            keep_going=lambda: self.running,
+        )
 
-        return files_to_process, analysis_errors
+        # Results are collected in scan order
+        for filepath, content_type in scanned:
+            video_info = video_infos.get(filepath)
+            if video_info is None:
+                if self.running:
+                    analysis_errors += 1  # probe_many logged the failure
+                continue
 
-    def _analyze_file(self, filepath: Path, content_type: str) -> dict | None:
-        """Analyze a single file for transcoding needs."""
-        try:
-            # Check file extension
-            extension = filepath.suffix.lower()
-            if extension == ".mp4":
-                # MP4 files don't need transcoding
+            if not video_info.probed:
                 self.logger.debug(f"MP4 file, no transcoding needed: {filepath.name}")
-                return {
-                    "path": filepath,
-                    "content_type": content_type,
-                    "needs_transcoding": False,
-                    "transcoded": False,
-                }
-
-            # Analyze non-MP4 files for transcoding needs
-            video_info = VideoInfo(filepath)
-            needs_trans = needs_transcoding(video_info)
+                mp4_files.append(FileInfo(filepath, content_type))
+                continue
 
+            needs_trans = needs_transcoding(video_info)
             self.logger.debug(f"File {filepath.name} needs transcoding: {needs_trans}")
+            files_to_process.append(
+                FileInfo(
+                    filepath,
+                    content_type,
+                    needs_transcoding=needs_trans,
+                    video_info=video_info if needs_trans else None,
+                )
+            )
 
-            return {
-                "path": filepath,
-                "content_type": content_type,
-                "needs_transcoding": needs_trans,
-                "transcoded": False,
-                "video_info": video_info if needs_trans else None,
-            }
+        return files_to_process, mp4_files, analysis_errors
 
-        except Exception as e:
-            self.logger.error(f"Error analyzing file {filepath}: {e}")
-            return None
-
-    def _parallel_transcode(self, files_to_process: list[dict]) -> None:
+    def _parallel_transcode(self, files_to_process: list[FileInfo]) -> None:
         """Transcode files in parallel using workers."""
         # Filter files that need transcoding
-        files_to_transcode = [f for f in files_to_process if f["needs_transcoding"]]
+        files_to_transcode = [f for f in files_to_process if f.needs_transcoding]
 
         if not files_to_transcode:
             self.logger.info("No files need transcoding")
             return
 
-        self.logger.info(f"Transcoding {len(files_to_transcode)} files with {self.workers} workers")
+        # Longest jobs first (LPT): big transcodes start early and finish alongside the
+        # small ones, instead of one late large file running on after the rest are done.
+        # The probe already gave each file's duration, so no extra I/O is needed
+        files_to_transcode.sort(
+            key=lambda f: (estimate_transcoding_time(f.video_info), f.video_info.size) if f.video_info else (0.0, 0),
+            reverse=True,
+        )
+
+        self.logger.info(
+            f"Transcoding {len(files_to_transcode)} files with {self.workers} workers, "
+            f"{self.transcode_settings['threads']} ffmpeg threads each"
+        )
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
             # Submit all transcoding jobs
@@ -267,30 +352,44 @@ class MediaTranscoder:
             }
 
             # Process completed jobs
+            total = len(files_to_transcode)
             completed = 0
+            last_progress = time.monotonic()
             for future in concurrent.futures.as_completed(future_to_file):
+                if not self.running:
+                    # Shutting down: drop queued jobs instead of starting new ffmpeg processes
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+
                 file_info = future_to_file[future]
                 completed += 1
 
                 try:
                     transcoded_path = future.result()
                     if transcoded_path:
-                        file_info["transcoded_path"] = transcoded_path
-                        file_info["transcoded"] = True
-                        self.logger.info(
-                            f"[{completed}/{len(files_to_transcode)}] Transcoded: {file_info['path'].name}"
-                        )
+                        file_info.transcoded_path = transcoded_path
+                        file_info.transcoded = True
+                        now = time.monotonic()
+                        if (
+                                completed == total
+                                or completed % _PROGRESS_LOG_EVERY == 0
+                                or now - last_progress >= _PROGRESS_LOG_INTERVAL
+                        ):
+                            last_progress = now
+                            self.logger.info("[%d/%d] Transcoded, latest: %s", completed, total, file_info.path.name)
                     else:
-                        self.logger.error(
-                            f"[{completed}/{len(files_to_transcode)}] Failed to transcode: {file_info['path'].name}"
-                        )
+                        # Failures are rare and worth seeing individually
+                        self.logger.error("[%d/%d] Failed to transcode: %s", completed, total, file_info.path.name)
 
                 except Exception as e:
-                    self.logger.error(f"Transcoding error for {file_info['path'].name}: {e}")
+                    self.logger.error(f"Transcoding error for {file_info.path.name}: {e}")
 
-    def _transcode_file(self, file_info: dict) -> Path | None:
+    def _transcode_file(self, file_info: FileInfo) -> Path | None:
         """Transcode a single file."""
-        filepath = file_info["path"]
+        filepath = file_info.path
+
+        if not self.running:
+            return None
 
         if self.dry_run:
             self.logger.info(f"DRY RUN: Would transcode {filepath}")
@@ -301,15 +400,19 @@ class MediaTranscoder:
             output_path = get_transcode_output_path(filepath)
 
             # Transcode
-            success = transcode_video(filepath, output_path)
+            success = transcode_video(filepath, output_path, self.transcode_settings, video_info=file_info.video_info)
 
             if success and validate_transcoded_file(filepath, output_path):
                 # Clean up original file
                 cleanup_transcoding_artifacts(filepath)
+                if filepath.suffix.lower() == ".mp4":
+                    # The validated output replaces an incompatible .mp4 under its original name
+                    output_path.replace(filepath)
+                    return filepath
                 return output_path
             else:
-                # Remove failed transcoding attempt
-                if output_path.exists():
+                # Remove failed transcoding attempt (never the source itself)
+                if output_path != filepath and output_path.exists():
                     output_path.unlink()
                 return None
 
@@ -317,26 +420,24 @@ class MediaTranscoder:
             self.logger.error(f"Transcoding failed for {filepath}: {e}")
             return None
 
-    def _move_to_upload_folder(self, file_info: dict) -> bool:
+    def _move_to_upload_folder(self, file_info: FileInfo) -> bool:
         """Move processed file to upload folder."""
         # Determine final path (either original or transcoded)
-        if file_info.get("transcoded_path"):
-            final_path = file_info["transcoded_path"]
-        else:
-            final_path = file_info["path"]
+        final_path = file_info.transcoded_path or file_info.path
 
-        content_type = file_info["content_type"]
-        upload_dir = Path(MEDIA_BASE_FOLDER, UPLOAD_FOLDER) / content_type
+        content_type = file_info.content_type
+        upload_dir = self._upload_dirs[content_type]
 
-        # Check if the file still exists
-        if not final_path.exists():
+        # Check if the file still exists; a transcoded output was just checked by
+        # validate_transcoded_file, but an original may have gone during a long transcode
+        if file_info.transcoded_path is None and not final_path.exists():
             self.logger.warning(f"File not found, skipping: {final_path}")
             return False
 
         # Construct destination path maintaining the directory structure
         try:
             # Try to get relative path from transcode folder
-            transcode_base = Path(MEDIA_BASE_FOLDER, TRANSCODE_FOLDER) / content_type
+            transcode_base = self._transcode_dirs[content_type]
             relative_path = final_path.relative_to(transcode_base)
         except ValueError:
             # Fallback to just the filename
@@ -377,7 +478,7 @@ class MediaTranscoder:
             return False
 
 
-def main():
+def main(argv: list[str] | None = None) -> int:
     """Main entry point for the CLI."""
     parser = argparse.ArgumentParser(
         description="Plex media file transcoder - handles video transcoding and file organization",
@@ -388,6 +489,9 @@ def main():
    %(prog)s /path/to/media                    # Process from custom directory
    %(prog)s --workers 8                       # Use 8 parallel workers for transcoding
    %(prog)s --dry-run                         # Preview changes without modifications
+   %(prog)s --no-hw-encoder                   # Always encode video in software (libx264)
+   %(prog)s --probe-mp4                       # Check .mp4 files' codecs instead of trusting the suffix
+   %(prog)s --scratch-dir /mnt/ssd/tmp        # Write ffmpeg output on fast local disk first
 
    %(prog)s --log-level DEBUG                 # Enable debug logging
         """,
@@ -414,18 +518,42 @@ def main():
 
     parser.add_argument(
         "--workers",
+        "--jobs",
+        "-j",
         type=int,
         default=WORKERS,
-        help=f"Number of worker processes for transcoding (default: {WORKERS})",
+        help=f"Number of concurrent ffmpeg transcodes; cores are split between them (default: {WORKERS})",
+    )
+
+    parser.add_argument(
+        "--no-hw-encoder",
+        dest="hw_encoder",
+        action="store_false",
+        help="Encode video in software even if a hardware encoder is available",
+    )
+
+    parser.add_argument(
+        "--probe-mp4",
+        action="store_true",
+        help="Probe .mp4 files and transcode them if their codecs are incompatible (default: trust the suffix)",
+    )
+
+    parser.add_argument(
+        "--scratch-dir",
+        help="Local directory ffmpeg writes into before each output is moved into place "
+             "(default: the system temp dir; falls back to the output folder when it lacks space)",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Create and run the media transcoder
     transcoder = MediaTranscoder(
         dry_run=args.dry_run,
         log_level=args.log_level,
         workers=args.workers,
+        hw_encoder=args.hw_encoder,
+        probe_mp4=args.probe_mp4,
+        scratch_dir=args.scratch_dir,
     )
 
     try:
@@ -437,6 +565,8 @@ def main():
         print(f"Error: {e}")
         sys.exit(1)
 
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -8,6 +8,7 @@ from .transcoder import (
     VideoInfo,
     cleanup_all_processes,
     cleanup_transcoding_artifacts,
+    estimate_transcoding_time,
     get_transcode_output_path,
     needs_transcoding,
     transcode_video,
@@ -18,6 +19,7 @@ __all__ = [
     "VideoInfo",
     "cleanup_all_processes",
     "cleanup_transcoding_artifacts",
+    "estimate_transcoding_time",
     "get_transcode_output_path",
     "needs_transcoding",
     "transcode_video",
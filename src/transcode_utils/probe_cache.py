@@ -0,0 +1,75 @@
+"""
+On-disk cache for ffprobe results.
+
+This module provides a small SQLite-backed cache of ffprobe output keyed by
+file path and stat fingerprint (mtime and size), so re-runs over the same
+library do not spawn ffprobe again for files that have not changed.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class ProbeCache:
+    """SQLite-backed ffprobe result cache, invalidated by file modification."""
+
+    def __init__(self, cache_dir: Path):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            cache_dir: Directory holding the cache database
+        """
+        self._lock = threading.Lock()
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(cache_dir / "probes.sqlite3"), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS probes ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, probe TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, path: Path, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+        """Return the cached probe for a file, or None if missing or the file has changed."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT probe FROM probes WHERE path = ? AND mtime_ns = ? AND size = ?",
+                    (str(path), mtime_ns, size),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read probe cache entry: {e}")
+            return None
+        if row is None:
+            return None
+        return orjson.loads(row[0]) if orjson is not None else json.loads(row[0])
+
+    def set(self, path: Path, mtime_ns: int, size: int, probe: Dict[str, Any]) -> None:
+        """Store the probe for a file at its current fingerprint."""
+        text = orjson.dumps(probe).decode("utf-8") if orjson is not None else json.dumps(probe)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO probes (path, mtime_ns, size, probe) VALUES (?, ?, ?, ?)",
+                    (str(path), mtime_ns, size, text),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to write probe cache entry: {e}")
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
@@ -5,37 +5,102 @@ This module provides functions for transcoding video files to formats
 compatible with Plex and various devices, especially Apple TVs.
 """
 
+import asyncio
 import atexit
+import functools
 import json
 import logging
+import os
+import platform
+import shutil
 import subprocess
+import tempfile
+import threading
+import weakref
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
-import ffmpeg
+try:
+    import orjson
+except Exception:
+    orjson = None
 
-from common.constants import TRANSCODE_SETTINGS
+try:
+    from ..common.constants import PROBE_CACHE_DIR, TRANSCODE_SETTINGS, VIDEO_EXTENSIONS
+except ImportError:
+    # Installed as top-level packages rather than imported through src
+    from common.constants import PROBE_CACHE_DIR, TRANSCODE_SETTINGS, VIDEO_EXTENSIONS
+
+from .probe_cache import ProbeCache
 
 logger = logging.getLogger(__name__)
 
-# Global set to track all active subprocesses
-_active_processes: Set[subprocess.Popen] = set()
+# Shared on-disk probe cache, opened on first use
+_probe_cache: Optional[ProbeCache] = None
+_probe_cache_disabled = False
+_probe_cache_lock = threading.Lock()
+
+# ffprobe arguments shared by single and batched probes (the file path is appended)
+_FFPROBE_ARGS = ("-v", "quiet", "-print_format", "json", "-show_format", "-show_streams")
+_FFPROBE_TIMEOUT = 60
+
+
+def _loads(data: bytes) -> Dict:
+    """Decode ffprobe JSON output, with orjson when it is installed."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# Bytes of scratch space claimed by transcodes in progress, so parallel jobs
+# do not all count the same free space
+_scratch_reserved = 0
+_scratch_lock = threading.Lock()
+
+# Suffix of the temporary files a transcode may leave next to its source
+_TMP_SUFFIX = ".tmp"
+
+# VAAPI render node used for hardware encoding on Linux
+_VAAPI_DEVICE = "/dev/dri/renderD128"
+
+
+@functools.lru_cache(maxsize=None)
+def _tool(name: str) -> str:
+    """
+    Resolve a command line tool to an absolute path, once per process.
+
+    Launching by absolute path with close_fds=False lets CPython start children with
+    posix_spawn instead of fork + exec, which avoids copying this process's page tables.
+    The pipes subprocess creates are close-on-exec, so close_fds=False leaks nothing.
+    """
+    return shutil.which(name) or name
+
+
+# Global set to track all active subprocesses; weak, so a process dropped without
+# being unregistered is not kept alive. Transcode threads register concurrently
+_active_processes: "weakref.WeakSet[subprocess.Popen]" = weakref.WeakSet()
+_active_lock = threading.Lock()
 
 
 def _register_process(process: subprocess.Popen) -> None:
     """Register a process for tracking and cleanup."""
-    _active_processes.add(process)
+    with _active_lock:
+        _active_processes.add(process)
 
 
 def _unregister_process(process: subprocess.Popen) -> None:
     """Unregister a process from tracking."""
-    _active_processes.discard(process)
+    with _active_lock:
+        _active_processes.discard(process)
 
 
 def cleanup_all_processes() -> None:
     """Terminate all tracked subprocesses."""
-    logger.info(f"Cleaning up {_active_processes.__len__()} active processes...")
-    for process in list(_active_processes):
+    # Snapshot under the lock, then wait on the processes without holding it
+    with _active_lock:
+        processes = list(_active_processes)
+        _active_processes.clear()
+
+    logger.info(f"Cleaning up {len(processes)} active processes...")
+    for process in processes:
         try:
             if process.poll() is None:  # Process is still running
                 process.terminate()
@@ -47,7 +112,6 @@ def cleanup_all_processes() -> None:
                     process.wait()
         except Exception as e:
             logger.error(f"Error cleaning up process: {e}")
-    _active_processes.clear()
 
 
 # Register cleanup function for atexit
@@ -60,10 +124,145 @@ class TranscodingError(Exception):
     pass
 
 
+def _get_probe_cache() -> Optional[ProbeCache]:
+    """Return the shared probe cache, opening it on first use."""
+    global _probe_cache, _probe_cache_disabled
+    with _probe_cache_lock:
+        if _probe_cache is None and not _probe_cache_disabled:
+            try:
+                _probe_cache = ProbeCache(Path(PROBE_CACHE_DIR))
+            except Exception as e:
+                logger.warning(f"Probe cache disabled: {e}")
+                _probe_cache_disabled = True
+        return _probe_cache
+
+
 class VideoInfo:
     """Container for video file information."""
 
-    def __init__(self, filepath: Path):
+    def __init__(self, filepath: Path, use_cache: bool = True, trust_container: bool = False):
+        """
+        Probe a video file.
+
+        Args:
+            filepath: Video file to probe
+            use_cache: Whether to reuse and store the probe in the on-disk probe cache
+            trust_container: Assume an .mp4 file is compatible and skip probing it;
+                codec, size and duration fields are then left unset
+        """
+        # Sidecars (.nfo, .srt, ...) are rejected before any ffprobe process is spawned
+        if filepath.suffix.lower() not in VIDEO_EXTENSIONS:
+            raise TranscodingError(f"Not a video file: {filepath}")
+
+        self._init_fields(filepath)
+        if trust_container and filepath.suffix.lower() == ".mp4":
+            self.video_compatible = self.audio_compatible = self.is_already_compatible = True
+            return
+        self._probe(use_cache)
+
+    @classmethod
+    def _from_probe(cls, filepath: Path, probe: Dict) -> "VideoInfo":
+        """Build a VideoInfo from already-fetched probe data without probing again."""
+        info = cls.__new__(cls)
+        info._init_fields(filepath)
+        info._parse_ffmpeg_probe(probe)
+        return info
+
+    @classmethod
+    def probe_many(
+            cls,
+            paths: Iterable[Path],
+            concurrency: int = 16,
+            use_cache: bool = True,
+            trust_container: bool = False,
+            keep_going: Optional[Callable[[], bool]] = None,
+    ) -> Dict[Path, "VideoInfo"]:
+        """
+        Probe many files, running up to `concurrency` ffprobe processes at once.
+
+        Args:
+            paths: Video files to probe
+            concurrency: Maximum number of ffprobe processes in flight
+            use_cache: Whether to reuse and store probes in the on-disk probe cache
+            trust_container: Assume .mp4 files are compatible and skip probing them
+            keep_going: Checked before each ffprobe starts; once it returns False the
+                remaining files are skipped (e.g. on shutdown)
+
+        Returns:
+            Dictionary mapping each successfully probed path to its VideoInfo;
+            files that fail to probe are logged and left out, skipped ones just left out
+        """
+        cache = _get_probe_cache() if use_cache else None
+        results: Dict[Path, VideoInfo] = {}
+        pending = []
+
+        for path in paths:
+            if path.suffix.lower() not in VIDEO_EXTENSIONS:
+                logger.error(f"Not a video file: {path}")
+                continue
+            if trust_container and path.suffix.lower() == ".mp4":
+                results[path] = cls(path, trust_container=True)
+                continue
+            try:
+                stat = path.stat()
+            except OSError as e:
+                logger.error(f"Failed to probe video file {path}: {e}")
+                continue
+            if stat.st_size == 0:
+                logger.error(f"Failed to probe video file {path}: file is empty")
+                continue
+            probe = cache.get(path, stat.st_mtime_ns, stat.st_size) if cache is not None else None
+            if probe is not None:
+                results[path] = cls._from_probe(path, probe)
+            else:
+                pending.append((path, stat))
+
+        if not pending:
+            return results
+
+        async def _probe_one(semaphore: asyncio.Semaphore, path: Path) -> Optional[Dict]:
+            async with semaphore:
+                if keep_going is not None and not keep_going():
+                    return None
+                proc = await asyncio.create_subprocess_exec(
+                    _tool("ffprobe"),
+                    *_FFPROBE_ARGS,
+                    str(path),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    close_fds=False,
+                )
+                try:
+                    stdout, stderr = await asyncio.wait_for(proc.communicate(), _FFPROBE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise TranscodingError("ffprobe timed out")
+                if proc.returncode != 0:
+                    raise TranscodingError(f"ffprobe failed: {stderr.decode(errors='replace')}")
+                return _loads(stdout)
+
+        async def _gather() -> list:
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+            return await asyncio.gather(*(_probe_one(semaphore, path) for path, _ in pending), return_exceptions=True)
+
+        for (path, stat), probe in zip(pending, asyncio.run(_gather())):
+            if probe is None:
+                continue  # Skipped after keep_going turned False
+            try:
+                if isinstance(probe, BaseException):
+                    raise probe
+                results[path] = cls._from_probe(path, probe)
+            except Exception as e:
+                logger.error(f"Failed to probe video file {path}: {e}")
+                continue
+            if cache is not None:
+                cache.set(path, stat.st_mtime_ns, stat.st_size, probe)
+
+        return results
+
+    def _init_fields(self, filepath: Path) -> None:
+        """Initialise every metadata field to its unprobed default."""
         self.filepath = filepath
         self.duration: Optional[float] = None
         self.size: int = 0
@@ -73,18 +272,27 @@ class VideoInfo:
         self.width: Optional[int] = None
         self.height: Optional[int] = None
         self.bitrate: Optional[int] = None
+        self.video_compatible: bool = False
+        self.audio_compatible: bool = False
         self.is_already_compatible: bool = False
+        self.probed: bool = False
 
-        self._probe()
-
-    def _probe(self) -> None:
-        """Probe the video file to extract metadata."""
+    def _probe(self, use_cache: bool = True) -> None:
+        """Probe the video file to extract metadata, reusing a cached probe if the file is unchanged."""
         try:
-            if ffmpeg is not None:
-                probe = ffmpeg.probe(str(self.filepath))
-                self._parse_ffmpeg_probe(probe)
+            stat = self.filepath.stat()
+            if stat.st_size == 0:
+                raise TranscodingError("file is empty")
+
+            cache = _get_probe_cache() if use_cache else None
+            if cache is not None:
+                probe = cache.get(self.filepath, stat.st_mtime_ns, stat.st_size)
+                if probe is None:
+                    probe = self._probe_with_ffprobe()
+                    cache.set(self.filepath, stat.st_mtime_ns, stat.st_size, probe)
             else:
-                self._probe_with_ffprobe()
+                probe = self._probe_with_ffprobe()
+            self._parse_ffmpeg_probe(probe)
         except Exception as e:
             logger.error(f"Failed to probe video file {self.filepath}: {e}")
             raise TranscodingError(f"Failed to probe video file: {e}")
@@ -111,19 +319,20 @@ class VideoInfo:
                 self.audio_codec = stream.get("codec_name")
                 self.audio_channels = int(stream.get("channels", 0))
 
+        self.probed = True
         self._check_compatibility()
 
-    def _probe_with_ffprobe(self) -> None:
+    def _probe_with_ffprobe(self) -> Dict:
         """Probe using ffprobe command line tool."""
-        cmd = ["ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", "-show_streams", str(self.filepath)]
+        cmd = [_tool("ffprobe"), *_FFPROBE_ARGS, str(self.filepath)]
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            # Keep stdout as bytes: orjson parses them directly without a text decode
+            result = subprocess.run(cmd, capture_output=True, timeout=_FFPROBE_TIMEOUT, close_fds=False)
             if result.returncode != 0:
-                raise TranscodingError(f"ffprobe failed: {result.stderr}")
+                raise TranscodingError(f"ffprobe failed: {result.stderr.decode(errors='replace')}")
 
-            probe_data = json.loads(result.stdout)
-            self._parse_ffmpeg_probe(probe_data)
+            return _loads(result.stdout)
 
         except subprocess.TimeoutExpired:
             raise TranscodingError("ffprobe timed out")
@@ -136,14 +345,131 @@ class VideoInfo:
         container_compatible = self.filepath.suffix.lower() == ".mp4"
 
         # Check video codec compatibility
-        video_compatible = self.video_codec in ["h264", "avc"]
+        self.video_compatible = self.video_codec in ["h264", "avc"]
 
         # Check audio codec compatibility
-        audio_compatible = self.audio_codec in ["aac", "mp3"] and (
+        self.audio_compatible = self.audio_codec in ["aac", "mp3"] and (
                 self.audio_channels is not None and self.audio_channels <= 2
         )
 
-        self.is_already_compatible = container_compatible and video_compatible and audio_compatible
+        self.is_already_compatible = container_compatible and self.video_compatible and self.audio_compatible
+
+
+def _hw_encoder_candidates() -> List[str]:
+    """Hardware H.264 encoders worth trying on this platform, in order of preference."""
+    system = platform.system()
+    if system == "Darwin":
+        return ["h264_videotoolbox"]
+    candidates = ["h264_nvenc", "h264_qsv"]
+    if system == "Linux" and Path(_VAAPI_DEVICE).exists():
+        candidates.append("h264_vaapi")
+    return candidates
+
+
+def _video_encoder_args(encoder: str, settings: Dict) -> Tuple[List[str], List[str]]:
+    """
+    Build the ffmpeg arguments for a video encoder.
+
+    Returns:
+        Tuple of (arguments placed before the input, arguments placed after it)
+    """
+    crf = int(settings["crf"])
+    # Pin the H.264 profile so output stays within what the target players decode
+    profile = ["-profile:v", settings["profile"]]
+    if encoder == "h264_videotoolbox":
+        # VideoToolbox quality runs 1-100 with higher meaning better
+        return [], ["-c:v", encoder, *profile, "-q:v", str(max(1, min(100, round(100 - crf * 1.5))))]
+    if encoder == "h264_nvenc":
+        return [], ["-c:v", encoder, *profile, "-rc", "vbr", "-cq", str(crf), "-b:v", "0"]
+    if encoder == "h264_qsv":
+        return [], ["-c:v", encoder, *profile, "-preset", settings["preset"], "-global_quality", str(crf)]
+    if encoder == "h264_vaapi":
+        return (
+            ["-vaapi_device", _VAAPI_DEVICE],
+            ["-vf", "format=nv12,hwupload", "-c:v", encoder, *profile, "-rc_mode", "CQP", "-qp", str(crf)],
+        )
+    # 8-bit 4:2:0 keeps 10-bit or 4:4:4 sources from being encoded outside the High profile
+    return [], ["-c:v", encoder, *profile, "-pix_fmt", "yuv420p", "-preset", settings["preset"], "-crf", str(crf)]
+
+
+@functools.lru_cache(maxsize=1)
+def _available_encoders() -> FrozenSet[str]:
+    """
+    List the encoders built into the installed ffmpeg, checked once per process.
+
+    Returns:
+        Encoder names, or an empty set if ffmpeg could not be queried
+    """
+    try:
+        result = subprocess.run(
+            [_tool("ffmpeg"), "-hide_banner", "-loglevel", "error", "-encoders"],
+            capture_output=True,
+            text=True,
+            timeout=10,
+            close_fds=False,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug(f"Failed to list ffmpeg encoders: {e}")
+        return frozenset()
+    if result.returncode != 0:
+        return frozenset()
+
+    # Encoder lines look like " V....D libx264    libx264 H.264 / AVC ...", below a
+    # legend of " V..... = Video" lines
+    encoders = set()
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if line.startswith((" V", " A")) and len(parts) > 1 and parts[1] != "=":
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+
+def _check_encoders(settings: Dict, video_info: VideoInfo) -> None:
+    """Fail fast if a codec this job needs is not built into ffmpeg."""
+    available = _available_encoders()
+    if not available:
+        return  # Could not list them; let ffmpeg report any problem itself
+
+    needed = []
+    if not video_info.video_compatible and not (settings.get("hw_encoder") and _detect_hw_encoder()):
+        needed.append(settings["video_codec"])
+    if not video_info.audio_compatible:
+        needed.append(settings["audio_codec"])
+
+    missing = [codec for codec in needed if codec not in available]
+    if missing:
+        raise TranscodingError(f"ffmpeg is missing required encoder(s): {', '.join(missing)}")
+
+
+@functools.lru_cache(maxsize=None)
+def _detect_hw_encoder() -> Optional[str]:
+    """
+    Find a working hardware H.264 encoder, checked once per process.
+
+    An encoder listed by `ffmpeg -encoders` is only compiled in, so each candidate is
+    also given a fraction of a second of test video to confirm the device is usable.
+
+    Returns:
+        Encoder name, or None to fall back to the software encoder
+    """
+    available = _available_encoders()
+    for encoder in _hw_encoder_candidates():
+        if encoder not in available:
+            continue
+        pre_input, encode_args = _video_encoder_args(encoder, TRANSCODE_SETTINGS)
+        cmd = [
+            _tool("ffmpeg"), "-hide_banner", "-loglevel", "error",
+            *pre_input, "-f", "lavfi", "-i", "color=size=256x256:duration=0.2",
+            *encode_args, "-f", "null", "-",
+        ]
+        try:
+            if subprocess.run(cmd, capture_output=True, timeout=15, close_fds=False).returncode == 0:
+                logger.info(f"Using hardware video encoder {encoder}")
+                return encoder
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        logger.debug(f"Hardware encoder {encoder} is listed but not usable")
+    return None
 
 
 def needs_transcoding(video_info: VideoInfo) -> bool:
@@ -156,14 +482,23 @@ def estimate_transcoding_time(video_info: VideoInfo) -> float:
     if not video_info.duration:
         return 0.0
 
-    # Rough estimate: transcoding takes about 1.5x real-time
-    # This would be calibrated based on actual performance
-    return video_info.duration * 1.5
+    # A stream-copy remux runs at disk speed rather than encoder speed
+    if not video_info.video_compatible:
+        # Rough estimate: transcoding takes about 1.5x real-time
+        # This would be calibrated based on actual performance
+        return video_info.duration * 1.5
+    if not video_info.audio_compatible:
+        return video_info.duration * 0.1
+    return video_info.duration * 0.02
 
 
 def get_transcode_output_path(input_path: Path) -> Path:
     """Generate output path for transcoded file."""
     # Change extension to .mp4 for transcoded files
+    if input_path.suffix.lower() == ".mp4":
+        # An incompatible .mp4 is transcoded beside itself, never on top of itself
+        # (compared case-insensitively: x.MP4 and x.mp4 are one file on macOS)
+        return input_path.with_name(f"{input_path.stem}.transcoded.mp4")
     return input_path.with_suffix(".mp4")
 
 
@@ -172,15 +507,20 @@ def transcode_video(
         output_path: Path,
         settings: Optional[Dict] = None,
         progress_callback: Optional[callable] = None,
+        video_info: Optional[VideoInfo] = None,
 ) -> bool:
     """
     Transcode a video file using FFmpeg.
 
+    Streams that are already compatible are copied rather than re-encoded, so a
+    file that only has the wrong container is remuxed at disk speed.
+
     Args:
         input_path: Input video file path
         output_path: Output video file path
         settings: Transcoding settings (uses default if None)
-        progress_callback: Callback function for progress updates
+        progress_callback: Called with the encoded output time in microseconds as it advances
+        video_info: Probe of the input file (probed here if None)
 
     Returns:
         True if transcoding succeeded, False otherwise
@@ -189,34 +529,112 @@ def transcode_video(
         settings = TRANSCODE_SETTINGS
 
     try:
-        if ffmpeg is not None:
-            return _transcode_with_python_ffmpeg(input_path, output_path, settings, progress_callback)
-        else:
-            return _transcode_with_ffmpeg_cli(input_path, output_path, settings, progress_callback)
+        if video_info is None:
+            video_info = VideoInfo(input_path)
+        _check_encoders(settings, video_info)
+
+        return _transcode_with_ffmpeg_cli(input_path, output_path, settings, progress_callback, video_info)
 
     except Exception as e:
         logger.error(f"Transcoding failed for {input_path}: {e}")
         raise TranscodingError(f"Transcoding failed: {e}")
 
 
-def _transcode_with_python_ffmpeg(
-        input_path: Path,
-        output_path: Path,
-        settings: Dict,
-        progress_callback: Optional[callable],
-) -> bool:
-    """Transcode using python-ffmpeg library."""
-    if ffmpeg is None:
-        logger.error("python-ffmpeg library not available")
-        return False
+def _reserve_scratch_dir(settings: Dict, input_path: Path, output_path: Path) -> Tuple[Path, int]:
+    """
+    Create a private directory for ffmpeg to write into.
 
-    try:
-        # Use ffmpeg directly since the python bindings have issues
-        return _transcode_with_ffmpeg_cli(input_path, output_path, settings, progress_callback)
+    Uses the configured scratch space (default: the system temp dir) when it has room
+    for an output the size of the source, counting space other running jobs have
+    already claimed; otherwise falls back to the output's own folder.
 
-    except Exception as e:
-        logger.error(f"FFmpeg error: {e}")
-        return False
+    Returns:
+        Tuple of (scratch directory, bytes reserved, to pass to _release_scratch)
+    """
+    global _scratch_reserved
+    scratch_base = settings.get("scratch_dir") or tempfile.gettempdir()
+    needed = input_path.stat().st_size
+
+    with _scratch_lock:
+        try:
+            free = shutil.disk_usage(scratch_base).free - _scratch_reserved
+        except OSError as e:
+            logger.warning(f"Cannot use scratch directory {scratch_base}: {e}")
+            free = -1
+        if free >= needed:
+            try:
+                scratch_dir = Path(tempfile.mkdtemp(prefix="transcode-", dir=scratch_base))
+                _scratch_reserved += needed
+                return scratch_dir, needed
+            except OSError as e:
+                logger.warning(f"Cannot use scratch directory {scratch_base}: {e}")
+        else:
+            logger.debug(f"Not enough scratch space in {scratch_base} for {input_path.name}, writing beside the output")
+
+    # Hidden, so a directory left behind by a crash is easy to tell apart from media
+    return Path(tempfile.mkdtemp(prefix=".transcode-", dir=output_path.parent)), 0
+
+
+def _release_scratch(reserved: int) -> None:
+    """Return scratch space claimed by _reserve_scratch_dir."""
+    global _scratch_reserved
+    with _scratch_lock:
+        _scratch_reserved -= reserved
+
+
+@functools.lru_cache(maxsize=8)
+def _build_cmd_template(
+        settings_key: Tuple[Tuple[str, object], ...], video_copy: bool, audio_copy: bool
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Build the ffmpeg arguments shared by every job with the same settings and stream plan.
+
+    Args:
+        settings_key: Transcoding settings as sorted (key, value) pairs, so they can be cached
+        video_copy: Whether the video stream is copied rather than re-encoded
+        audio_copy: Whether the audio stream is copied rather than re-encoded
+
+    Returns:
+        Tuple of (arguments placed before the input, arguments between the input and the output path)
+    """
+    settings = dict(settings_key)
+
+    # Copy streams that are already compatible; only re-encode the ones that are not
+    if video_copy:
+        pre_input, args = [], ["-c:v", "copy"]
+    else:
+        encoder = (settings.get("hw_encoder") and _detect_hw_encoder()) or settings["video_codec"]
+        pre_input, args = _video_encoder_args(encoder, settings)
+        if settings.get("threads"):
+            # Cap encoder threads so concurrent jobs share the cores instead of oversubscribing them
+            args += ["-threads", str(settings["threads"])]
+
+    if audio_copy:
+        args += ["-c:a", "copy"]
+    else:
+        args += [
+            "-c:a",
+            settings["audio_codec"],
+            "-b:a",
+            settings["audio_bitrate"],
+            "-ac",
+            str(settings["max_audio_channels"]),
+        ]
+
+    # Put the index up front so Plex can start playback without seeking to the end of the file;
+    # the rewrite this needs happens in local scratch space, before the move into place
+    args += ["-movflags", "+faststart"]
+
+    args += [
+        "-y",  # Overwrite output file
+        # Machine-readable key=value progress on stdout instead of the human status line
+        "-nostats",
+        "-loglevel",
+        "error",
+        "-progress",
+        "pipe:1",
+    ]
+    return tuple(pre_input), tuple(args)
 
 
 def _transcode_with_ffmpeg_cli(
@@ -224,58 +642,48 @@ def _transcode_with_ffmpeg_cli(
         output_path: Path,
         settings: Dict,
         progress_callback: Optional[callable],
+        video_info: VideoInfo,
 ) -> bool:
     """Transcode using FFmpeg command line interface."""
-    cmd = [
-        "ffmpeg",
-        "-i",
-        str(input_path),
-        "-c:v",
-        settings["video_codec"],
-        "-preset",
-        settings["preset"],
-        "-crf",
-        str(settings["crf"]),
-        "-c:a",
-        settings["audio_codec"],
-        "-b:a",
-        settings["audio_bitrate"],
-        "-ac",
-        str(settings["max_audio_channels"]),
-        "-y",  # Overwrite output file
-        str(output_path),
-    ]
+    pre_input, post_input = _build_cmd_template(
+        tuple(sorted(settings.items())), video_info.video_compatible, video_info.audio_compatible
+    )
+    # Encode into local scratch space and move the finished file into place in one go,
+    # rather than having the muxer write (and faststart rewrite) over a slow network share
+    scratch_dir, reserved = _reserve_scratch_dir(settings, input_path, output_path)
+    scratch_path = scratch_dir / output_path.name
+    cmd = [_tool("ffmpeg"), *pre_input, "-i", str(input_path), *post_input, str(scratch_path)]
 
     process = None
     try:
         logger.info(f"Starting transcoding: {' '.join(cmd)}")
 
+        # Read raw bytes: progress records are ASCII, so nothing needs decoding
         process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
+            close_fds=False,
         )
 
         # Register process for cleanup
         _register_process(process)
 
-        # Monitor progress
+        # Monitor progress (the pipe is drained even without a callback so ffmpeg never blocks)
         if process.stdout:
             for line in process.stdout:
-                if progress_callback:
-                    # Parse progress from FFmpeg output (simplified)
-                    if "time=" in line:
-                        try:
-                            time_str = line.split("time=")[1].split()[0]
-                            # Convert to seconds and call callback
-                            progress_callback(time_str)
-                        except (IndexError, ValueError):
-                            pass
+                key, _, value = line.strip().partition(b"=")
+                if key == b"out_time_us" and progress_callback:
+                    try:
+                        progress_callback(int(value))
+                    except ValueError:
+                        pass  # "N/A" until the first frame is written
 
         return_code = process.wait()
 
         if return_code == 0:
+            # Falls back to copy + unlink when scratch and output are on different filesystems
+            shutil.move(str(scratch_path), str(output_path))
             logger.info(f"Transcoding completed: {output_path}")
             return True
         else:
@@ -305,6 +713,8 @@ def _transcode_with_ffmpeg_cli(
         # Unregister process from tracking
         if process:
             _unregister_process(process)
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+        _release_scratch(reserved)
 
 
 def validate_transcoded_file(original_path: Path, transcoded_path: Path) -> bool:
@@ -322,7 +732,8 @@ def validate_transcoded_file(original_path: Path, transcoded_path: Path) -> bool
             return False
 
         # Try to probe the transcoded file
-        transcoded_info = VideoInfo(transcoded_path)
+        # Always probe the fresh output rather than trusting a cached entry or its suffix
+        transcoded_info = VideoInfo(transcoded_path, use_cache=False, trust_container=False)
 
         # Check that it has video and audio streams
         return transcoded_info.video_codec is not None and transcoded_info.audio_codec is not None
@@ -334,16 +745,18 @@ def validate_transcoded_file(original_path: Path, transcoded_path: Path) -> bool
 
 def cleanup_transcoding_artifacts(filepath: Path) -> None:
     """Clean up temporary files and artifacts from transcoding."""
-    # Remove any temporary files that might have been created
-    temp_patterns = [
-        filepath.with_suffix(filepath.suffix + ".tmp"),
-        filepath.with_suffix(".tmp"),
-    ]
+    # Remove any temporary files that might have been created ("<name>.tmp" and "<stem>.tmp"),
+    # built as plain strings rather than two derived Path objects
+    path = str(filepath)
+    temp_patterns = (path + _TMP_SUFFIX, path[: len(path) - len(filepath.suffix)] + _TMP_SUFFIX)
 
+    # Unlink directly rather than stat first: a missing file is the common case and
+    # costs the same single syscall, without listing a possibly huge directory
     for temp_file in temp_patterns:
-        if temp_file.exists():
-            try:
-                temp_file.unlink()
-                logger.debug(f"Cleaned up temporary file: {temp_file}")
-            except OSError as e:
-                logger.warning(f"Failed to clean up temporary file {temp_file}: {e}")
+        try:
+            os.unlink(temp_file)
+            logger.debug(f"Cleaned up temporary file: {temp_file}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to clean up temporary file {temp_file}: {e}")
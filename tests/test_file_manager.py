@@ -0,0 +1,59 @@
+"""Tests for cross-device file moves."""
+
+import errno
+import os
+
+import pytest
+
+from src.common import file_manager
+
+
+def _raise_exdev(*args, **kwargs):
+    raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+
+@pytest.fixture
+def no_fast_copy(monkeypatch):
+    """Make reflink unavailable and copy_file_range fail as it does between unsupported filesystems."""
+    fallocated = []
+    monkeypatch.setattr(file_manager, "_try_reflink", lambda fin, fout: False)
+    monkeypatch.setattr(os, "copy_file_range", _raise_exdev, raising=False)
+    monkeypatch.setattr(os, "posix_fallocate", lambda *args: fallocated.append(args), raising=False)
+    return fallocated
+
+
+def test_fast_move_gives_up_and_removes_partial_destination(tmp_path, no_fast_copy):
+    source = tmp_path / "source.mkv"
+    destination = tmp_path / "destination.mkv"
+    source.write_bytes(b"x" * 4096)
+
+    assert file_manager._fast_cross_device_move(source, destination) is False
+    assert not destination.exists()
+    assert source.read_bytes() == b"x" * 4096
+    # Nothing is preallocated when the first copy already fails
+    assert no_fast_copy == []
+
+
+def test_move_falls_back_to_shutil_move(tmp_path, monkeypatch, no_fast_copy):
+    source = tmp_path / "source.mkv"
+    destination = tmp_path / "out" / "destination.mkv"
+    source.write_bytes(b"x" * 4096)
+    monkeypatch.setattr(os, "replace", _raise_exdev)
+
+    file_manager._move_file(source, destination)
+
+    assert destination.read_bytes() == b"x" * 4096
+    assert not source.exists()
+
+
+def test_fast_move_copies_in_kernel(tmp_path):
+    if not hasattr(os, "copy_file_range"):
+        pytest.skip("copy_file_range not available")
+    source = tmp_path / "source.mkv"
+    destination = tmp_path / "destination.mkv"
+    data = os.urandom(3 * 1024 * 1024 + 7)
+    source.write_bytes(data)
+
+    assert file_manager._fast_cross_device_move(source, destination) is True
+    assert destination.read_bytes() == data
+    assert not source.exists()
@@ -0,0 +1,54 @@
+"""Tests for the on-disk ffprobe result cache."""
+
+import pytest
+
+from src.transcode_utils.probe_cache import ProbeCache
+
+PROBE = {"streams": [{"codec_type": "video", "codec_name": "h264"}], "format": {"format_name": "matroska"}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ProbeCache(tmp_path)
+    yield cache
+    cache.close()
+
+
+def test_hit_for_unchanged_file(cache, tmp_path):
+    path = tmp_path / "a.mkv"
+    cache.set(path, mtime_ns=1000, size=42, probe=PROBE)
+    assert cache.get(path, mtime_ns=1000, size=42) == PROBE
+
+
+def test_miss_when_mtime_changes(cache, tmp_path):
+    path = tmp_path / "a.mkv"
+    cache.set(path, mtime_ns=1000, size=42, probe=PROBE)
+    assert cache.get(path, mtime_ns=2000, size=42) is None
+
+
+def test_miss_when_size_changes(cache, tmp_path):
+    path = tmp_path / "a.mkv"
+    cache.set(path, mtime_ns=1000, size=42, probe=PROBE)
+    assert cache.get(path, mtime_ns=1000, size=43) is None
+
+
+def test_new_fingerprint_replaces_old_entry(cache, tmp_path):
+    path = tmp_path / "a.mkv"
+    cache.set(path, mtime_ns=1000, size=42, probe=PROBE)
+    cache.set(path, mtime_ns=2000, size=50, probe={"streams": []})
+
+    assert cache.get(path, mtime_ns=1000, size=42) is None
+    assert cache.get(path, mtime_ns=2000, size=50) == {"streams": []}
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = tmp_path / "a.mkv"
+    cache = ProbeCache(tmp_path)
+    cache.set(path, mtime_ns=1000, size=42, probe=PROBE)
+    cache.close()
+
+    reopened = ProbeCache(tmp_path)
+    try:
+        assert reopened.get(path, mtime_ns=1000, size=42) == PROBE
+    finally:
+        reopened.close()
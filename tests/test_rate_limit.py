@@ -0,0 +1,51 @@
+"""Tests for the token bucket rate limiter."""
+
+import time
+
+import pytest
+
+from src.common.rate_limit import TokenBucket
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record requested sleeps instead of sleeping."""
+    recorded = []
+    monkeypatch.setattr(time, "sleep", recorded.append)
+    return recorded
+
+
+def test_burst_is_served_without_waiting(sleeps):
+    bucket = TokenBucket(rate=10, capacity=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert sleeps == []
+
+
+def test_acquire_waits_once_the_burst_is_spent(sleeps):
+    bucket = TokenBucket(rate=10, capacity=2)
+    for _ in range(4):
+        bucket.acquire()
+
+    # Each token past the burst is owed one refill interval (0.1s) more than the last
+    assert len(sleeps) == 2
+    assert sleeps[0] == pytest.approx(0.1, abs=0.02)
+    assert sleeps[1] == pytest.approx(0.2, abs=0.02)
+
+
+def test_pause_holds_back_the_next_acquire(sleeps):
+    bucket = TokenBucket(rate=10, capacity=5)
+    bucket.pause(1.5)
+    bucket.acquire()
+
+    assert len(sleeps) == 1
+    assert sleeps[0] == pytest.approx(1.6, abs=0.02)
+
+
+def test_pause_shorter_than_the_current_debt_does_not_shorten_it(sleeps):
+    bucket = TokenBucket(rate=10, capacity=1)
+    bucket.pause(2.0)
+    bucket.pause(0.5)
+    bucket.acquire()
+
+    assert sleeps[0] == pytest.approx(2.1, abs=0.02)
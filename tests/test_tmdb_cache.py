@@ -0,0 +1,93 @@
+"""Tests for the TMDb response cache and the client's ETag revalidation."""
+
+import time
+
+import pytest
+import requests
+
+from src.common.tmdb_cache import TMDbCache
+from src.rename_utils.tmdb_client import TMDbClient
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TMDbCache(tmp_path, ttl=60)
+    yield cache
+    cache.close()
+
+
+def _response(status: int, body: bytes = b"", headers: dict | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class _FakeSession:
+    """Stands in for requests.Session, replaying canned responses and recording request headers."""
+
+    def __init__(self, *responses: requests.Response):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.sent_headers.append(headers)
+        return self.responses.pop(0)
+
+
+def test_fresh_entry_is_returned(cache):
+    key = TMDbCache.make_key("movie/1")
+    cache.set(key, {"id": 1})
+    assert cache.get(key) == {"id": 1}
+
+
+def test_expired_entry_is_a_miss_but_kept_for_revalidation(cache):
+    key = TMDbCache.make_key("movie/1")
+    cache.set(key, {"id": 1}, expire=0, etag='"abc"')
+    time.sleep(0.01)
+
+    assert cache.get(key) is None
+    assert cache.get_stale(key) == ({"id": 1}, '"abc"')
+
+
+def test_touch_makes_an_expired_entry_fresh_again(cache):
+    key = TMDbCache.make_key("movie/1")
+    cache.set(key, {"id": 1}, expire=0)
+    time.sleep(0.01)
+
+    cache.touch(key, expire=60)
+    assert cache.get(key) == {"id": 1}
+
+
+def test_make_key_ignores_parameter_order():
+    assert TMDbCache.make_key("search/tv", {"query": "x", "year": "2020"}) == TMDbCache.make_key(
+        "search/tv", {"year": "2020", "query": "x"}
+    )
+
+
+def test_client_revalidates_stale_entry_with_etag(cache):
+    client = TMDbClient(api_key="test", use_cache=False)
+    client.cache = cache
+    key = TMDbCache.make_key("movie/1", None)
+    cache.set(key, {"id": 1}, expire=0, etag='"abc"')
+    time.sleep(0.01)
+    client.session = _FakeSession(_response(304))
+
+    assert client._make_request("movie/1") == {"id": 1}
+    assert client.session.sent_headers == [{"If-None-Match": '"abc"'}]
+    # The 304 refreshed the entry, so the next lookup does not hit the API
+    assert cache.get(key) == {"id": 1}
+
+
+def test_client_replaces_stale_entry_when_modified(cache):
+    client = TMDbClient(api_key="test", use_cache=False)
+    client.cache = cache
+    key = TMDbCache.make_key("movie/1", None)
+    cache.set(key, {"id": 1, "title": "Old"}, expire=0, etag='"abc"')
+    time.sleep(0.01)
+    client.session = _FakeSession(_response(200, b'{"id": 1, "title": "New"}', {"ETag": '"def"'}))
+
+    assert client._make_request("movie/1") == {"id": 1, "title": "New"}
+    assert cache.get(key) == {"id": 1, "title": "New"}
+    assert cache.get_stale(key)[1] == '"def"'
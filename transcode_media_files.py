@@ -3,10 +3,13 @@
 Wrapper script for media transcoder.
 """
 
-import subprocess
 import sys
+from pathlib import Path
 
-# Run module from src directory
-result = subprocess.run([sys.executable, "src/transcode_media_files.py"] + sys.argv[1:])
+# Run module from src directory in-process; importing it as a top-level module
+# (as the installed console script does) keeps a single copy of each package
+sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-sys.exit(result.returncode)
+from transcode_media_files import main  # noqa: E402
+
+sys.exit(main(sys.argv[1:]))